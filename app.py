@@ -1,18 +1,22 @@
-import random
-import re
+import io
+import os
 
-import pandas as pd
 import streamlit as st
-from faker import Faker
 
-
-# Инициализация Faker с кешированием
-@st.cache_resource
-def get_fakers():
-    return Faker('ru_RU'), Faker('en_US')
-
-
-fake_ru, fake_en = get_fakers()
+from testdatagen import exporters, related, validators
+from testdatagen.cache import LRUCache
+from testdatagen.columns import text_frame
+from testdatagen.compression import FILE_COMPRESSIONS, compress_bytes, compressed_name
+from testdatagen.engine import generate_dataframe
+from testdatagen.profiling import profiling
+from testdatagen.generators import (
+    generate_bank_card,
+    generate_inn_company,
+    generate_inn_individual,
+    generate_snils,
+)
+from testdatagen.templates import compile_template, delete_template, list_templates, make_template
+from testdatagen.templates import save_template as save_template_file
 
 st.set_page_config(
     page_title="Генератор Тестовых Данных",
@@ -21,230 +25,40 @@ st.set_page_config(
 )
 # Ограничение для бесплатного хостинга
 MAX_RECORDS = 50
+# Предпросмотр показывает одну страницу, файлы экспорта собираются только по клику
+PAGE_SIZE = 100
+COPY_PREVIEW_ROWS = 20
+EXPORT_FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "JSON": ("json", "application/json"),
+    "XML": ("xml", "application/xml"),
+    "SQL": ("sql", "text/plain"),
+}
+DOWNLOAD_COMPRESSIONS = ["Без сжатия", "gzip", "zstd", "xz"]
 
 
-def generate_snils():
-    digits = [random.randint(0, 9) for _ in range(9)]
-    checksum = sum((9 - i) * digits[i] for i in range(9))
-    if checksum < 100:
-        control = checksum
-    elif checksum == 100 or checksum == 101:
-        control = 0
-    else:
-        control = checksum % 101
-        if control == 100:
-            control = 0
-    digits_str = ''.join(map(str, digits))
-    return f"{digits_str[:3]}-{digits_str[3:6]}-{digits_str[6:9]} {control:02d}"
-
-
-def generate_inn_individual():
-    digits = [random.randint(0, 9) for _ in range(10)]
-    weights1 = [7, 2, 4, 10, 3, 5, 9, 4, 6, 8]
-    weights2 = [3, 7, 2, 4, 10, 3, 5, 9, 4, 6, 8]
-    n11 = sum(digits[i] * weights1[i] for i in range(10)) % 11 % 10
-    digits.append(n11)
-    n12 = sum(digits[i] * weights2[i] for i in range(11)) % 11 % 10
-    digits.append(n12)
-    return ''.join(map(str, digits))
-
-
-def generate_inn_company():
-    digits = [random.randint(0, 9) for _ in range(9)]
-    weights = [2, 4, 10, 3, 5, 9, 4, 6, 8]
-    n10 = sum(digits[i] * weights[i] for i in range(9)) % 11 % 10
-    digits.append(n10)
-    return ''.join(map(str, digits))
-
-
-def generate_bank_card():
-    prefixes = ['4', '51', '52', '53', '54', '55', '2200', '2201', '2202', '2203', '2204']
-    prefix = random.choice(prefixes)
-    remaining = 16 - len(prefix) - 1
-    digits = list(prefix) + [str(random.randint(0, 9)) for _ in range(remaining)]
-
-    def luhn_checksum(card_number):
-        def digits_of(n):
-            return [int(d) for d in str(n)]
-
-        digits_list = digits_of(card_number)
-        odd_digits = digits_list[-1::-2]
-        even_digits = digits_list[-2::-2]
-        checksum = sum(odd_digits)
-        for d in even_digits:
-            checksum += sum(digits_of(d * 2))
-        return checksum % 10
-
-    partial = ''.join(digits)
-    for check_digit in range(10):
-        if luhn_checksum(partial + str(check_digit)) == 0:
-            digits.append(str(check_digit))
-            break
-
-    card = ''.join(digits)
-    return f"{card[:4]} {card[4:8]} {card[8:12]} {card[12:16]}"
-
-
-@st.cache_data(ttl=3600)
-def validate_snils(snils):
-    clean = re.sub(r'\D', '', snils)
-    if len(clean) != 11:
-        return False, "СНИЛС должен содержать 11 цифр"
-    digits = [int(d) for d in clean[:9]]
-    control = int(clean[9:11])
-    checksum = sum((9 - i) * digits[i] for i in range(9))
-    if checksum < 100:
-        expected = checksum
-    elif checksum == 100 or checksum == 101:
-        expected = 0
-    else:
-        expected = checksum % 101
-        if expected == 100:
-            expected = 0
-    if control == expected:
-        return True, "СНИЛС валиден"
-    return False, f"Неверная контрольная сумма (ожидалось {expected:02d})"
-
-
-@st.cache_data(ttl=3600)
-def validate_inn(inn):
-    clean = re.sub(r'\D', '', inn)
-    if len(clean) == 12:
-        digits = [int(d) for d in clean]
-        weights1 = [7, 2, 4, 10, 3, 5, 9, 4, 6, 8]
-        weights2 = [3, 7, 2, 4, 10, 3, 5, 9, 4, 6, 8]
-        n11 = sum(digits[i] * weights1[i] for i in range(10)) % 11 % 10
-        n12 = sum(digits[i] * weights2[i] for i in range(11)) % 11 % 10
-        if digits[10] == n11 and digits[11] == n12:
-            return True, "ИНН физлица валиден"
-        return False, "Неверная контрольная сумма ИНН физлица"
-    elif len(clean) == 10:
-        digits = [int(d) for d in clean]
-        weights = [2, 4, 10, 3, 5, 9, 4, 6, 8]
-        n10 = sum(digits[i] * weights[i] for i in range(9)) % 11 % 10
-        if digits[9] == n10:
-            return True, "ИНН юрлица валиден"
-        return False, "Неверная контрольная сумма ИНН юрлица"
-    return False, "ИНН должен содержать 10 или 12 цифр"
-
-
-@st.cache_data(ttl=3600)
-def validate_card(card):
-    clean = re.sub(r'\D', '', card)
-    if len(clean) != 16:
-        return False, "Номер карты должен содержать 16 цифр"
-
-    def luhn_check(card_number):
-        digits = [int(d) for d in card_number]
-        odd_digits = digits[-1::-2]
-        even_digits = digits[-2::-2]
-        checksum = sum(odd_digits)
-        for d in even_digits:
-            checksum += sum(int(x) for x in str(d * 2))
-        return checksum % 10 == 0
-
-    if luhn_check(clean):
-        return True, "Номер карты валиден (Luhn)"
-    return False, "Неверная контрольная сумма Luhn"
-
-
-@st.cache_data(ttl=3600)
-def df_to_xml(df, root_name="data", row_name="record"):
-    xml_lines = [f'<?xml version="1.0" encoding="UTF-8"?>']
-    xml_lines.append(f'<{root_name}>')
-    for _, row in df.iterrows():
-        xml_lines.append(f'  <{row_name}>')
-        for col in df.columns:
-            safe_col = re.sub(r'[^\w]', '_', col)
-            value = str(row[col]).replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
-            xml_lines.append(f'    <{safe_col}>{value}</{safe_col}>')
-        xml_lines.append(f'  </{row_name}>')
-    xml_lines.append(f'</{root_name}>')
-    return '\n'.join(xml_lines)
-
-
-@st.cache_data(ttl=3600)
-def df_to_sql(df, table_name="test_data"):
-    safe_table = re.sub(r'[^\w]', '_', table_name)
-    columns = [re.sub(r'[^\w]', '_', col) for col in df.columns]
-    sql_lines = []
-    for _, row in df.iterrows():
-        values = []
-        for col in df.columns:
-            val = str(row[col]).replace("'", "''")
-            values.append(f"'{val}'")
-        sql_lines.append(f"INSERT INTO {safe_table} ({', '.join(columns)}) VALUES ({', '.join(values)});")
-    return '\n'.join(sql_lines)
-
-
-@st.cache_data(ttl=3600)
-def generate_related_data(count):
-    if count > 20:  # Ограничение для связанных данных
-        count = 20
-
-    users = []
-    orders = []
-
-    for i in range(count):
-        user_id = i + 1
-        user = {
-            'user_id': user_id,
-            'name': fake_ru.name(),
-            'email': fake_en.email(),
-            'phone': fake_ru.phone_number(),
-            'registration_date': fake_ru.date_this_year().strftime('%d.%m.%Y')
-        }
-        users.append(user)
-
-        num_orders = random.randint(1, 3)
-        for j in range(num_orders):
-            order = {
-                'order_id': len(orders) + 1,
-                'user_id': user_id,
-                'product': fake_ru.word().capitalize(),
-                'amount': round(random.uniform(100, 10000), 2),
-                'order_date': fake_ru.date_this_month().strftime('%d.%m.%Y'),
-                'status': random.choice(['Новый', 'В обработке', 'Отправлен', 'Доставлен'])
-            }
-            orders.append(order)
-
-    return pd.DataFrame(users), pd.DataFrame(orders)
-
-
-DATA_TYPES = {
-    "Имя (русское)": lambda: fake_ru.first_name(),
-    "Фамилия (русская)": lambda: fake_ru.last_name(),
-    "Полное имя (русское)": lambda: fake_ru.name(),
-    "Имя (английское)": lambda: fake_en.first_name(),
-    "Фамилия (английская)": lambda: fake_en.last_name(),
-    "Полное имя (английское)": lambda: fake_en.name(),
-    "Email": lambda: fake_en.email(),
-    "Телефон (Россия)": lambda: fake_ru.phone_number(),
-    "Телефон (США)": lambda: fake_en.phone_number(),
-    "Адрес (Россия)": lambda: fake_ru.address().replace('\n', ', '),
-    "Адрес (США)": lambda: fake_en.address().replace('\n', ', '),
-    "Город (Россия)": lambda: fake_ru.city(),
-    "Город (США)": lambda: fake_en.city(),
-    "Почтовый индекс": lambda: fake_ru.postcode(),
-    "Дата рождения": lambda: fake_ru.date_of_birth(minimum_age=18, maximum_age=80).strftime('%d.%m.%Y'),
-    "Дата (случайная)": lambda: fake_ru.date_this_decade().strftime('%d.%m.%Y'),
-    "Время": lambda: fake_ru.time(),
-    "Пароль (простой)": lambda: fake_en.password(length=8, special_chars=False),
-    "Пароль (сложный)": lambda: fake_en.password(length=16, special_chars=True, digits=True, upper_case=True),
-    "Компания": lambda: fake_ru.company(),
-    "Должность": lambda: fake_ru.job(),
-    "UUID": lambda: str(fake_en.uuid4()),
-    "IPv4 адрес": lambda: fake_en.ipv4(),
-    "URL": lambda: fake_en.url(),
-    "Номер карты (простой)": lambda: fake_en.credit_card_number(),
-    "Текст (предложение)": lambda: fake_ru.sentence(),
-    "Текст (абзац)": lambda: fake_ru.paragraph(nb_sentences=3),
-    "Логин": lambda: fake_en.user_name(),
-    "СНИЛС": generate_snils,
-    "ИНН (физлицо)": generate_inn_individual,
-    "ИНН (юрлицо)": generate_inn_company,
-    "Банковская карта": generate_bank_card,
-}
+# Общий для всех сессий кэш с ограничением по числу записей и объёму
+@st.cache_resource
+def get_cache():
+    return LRUCache(
+        max_entries=int(os.environ.get('TESTDATAGEN_CACHE_ENTRIES', 1024)),
+        max_bytes=int(os.environ.get('TESTDATAGEN_CACHE_BYTES', 64 * 1024 * 1024)),
+    )
+
+
+cache = get_cache()
+validate_snils = cache.memoize(validators.validate_snils)
+validate_inn = cache.memoize(validators.validate_inn)
+validate_card = cache.memoize(validators.validate_card)
+df_to_sql = cache.memoize(exporters.df_to_sql)
+render_text = cache.memoize(exporters.render_text)
+generate_related_data = cache.memoize(related.generate_related_data)
+
+
+def lazy_export(df, fmt, compress=None):
+    if compress is None:
+        return lambda: render_text(df, fmt)
+    return lambda: compress_bytes(render_text(df, fmt).encode('utf-8'), compress)
 
 st.markdown("""
 <style>
@@ -352,8 +166,7 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
-if 'templates' not in st.session_state:
-    st.session_state.templates = {}
+saved_templates = list_templates()
 
 tabs = st.tabs(["Генератор данных", "Связанные данные", "Валидация", "Шаблоны"])
 
@@ -365,7 +178,8 @@ with tabs[0]:
 
         categories = {
             "Персональные данные": ["Имя (русское)", "Фамилия (русская)", "Полное имя (русское)",
-                                    "Имя (английское)", "Фамилия (английская)", "Полное имя (английское)"],
+                                    "Имя (английское)", "Фамилия (английская)", "Полное имя (английское)",
+                                    "Возраст"],
             "Контакты": ["Email", "Телефон (Россия)", "Телефон (США)"],
             "Адреса": ["Адрес (Россия)", "Адрес (США)", "Город (Россия)", "Город (США)", "Почтовый индекс"],
             "Даты и время": ["Дата рождения", "Дата (случайная)", "Время"],
@@ -394,6 +208,8 @@ with tabs[0]:
             help=f"На бесплатном хостинге ограничение: {MAX_RECORDS} записей"
         )
 
+        profile_generation = st.checkbox("Профилировать генерацию", help="Показать время по колонкам и стадиям")
+
         col_btn1, col_btn2 = st.columns(2)
         with col_btn1:
             generate_button = st.button("Сгенерировать", type="primary", use_container_width=True)
@@ -401,11 +217,9 @@ with tabs[0]:
             save_template = st.button("Сохранить шаблон", use_container_width=True)
 
         if save_template and selected_types:
-            template_name = st.session_state.get('new_template_name', f"Шаблон {len(st.session_state.templates) + 1}")
-            st.session_state.templates[template_name] = {
-                'types': selected_types,
-                'count': count
-            }
+            template_name = st.session_state.get('new_template_name') or f"Шаблон {len(saved_templates) + 1}"
+            save_template_file(make_template(template_name, selected_types, count))
+            saved_templates = list_templates()
             st.success(f"Шаблон сохранён!")
 
         template_name_input = st.text_input("Имя шаблона:", key="new_template_name", placeholder="Введите имя шаблона")
@@ -415,8 +229,14 @@ with tabs[0]:
 
         if generate_button and selected_types:
             with st.spinner("Генерация данных..."):
-                data = {dtype: [DATA_TYPES[dtype]() for _ in range(count)] for dtype in selected_types}
-                df = pd.DataFrame(data)
+                if profile_generation:
+                    with profiling() as profiler:
+                        df = generate_dataframe(selected_types, count)
+                        render_text(df, 'csv')
+                    st.session_state['generation_profile'] = profiler.report()
+                else:
+                    df = generate_dataframe(selected_types, count)
+                    st.session_state.pop('generation_profile', None)
                 st.session_state['generated_data'] = df
                 st.session_state['generated'] = True
         elif generate_button and not selected_types:
@@ -435,78 +255,47 @@ with tabs[0]:
             with stat_cols[2]:
                 st.metric("Всего ячеек", len(df) * len(df.columns))
 
-            st.dataframe(df, use_container_width=True, height=300)
+            if 'generation_profile' in st.session_state:
+                with st.expander("Профиль генерации", expanded=True):
+                    generation_profile = st.session_state['generation_profile']
+                    st.dataframe(generation_profile['stages'], use_container_width=True,
+                                 column_order=["name", "calls", "seconds", "rows", "rows_per_sec", "bytes", "share"])
+                    st.caption(f"Всего: {generation_profile['elapsed']:.3f} с")
+
+            pages = (len(df) + PAGE_SIZE - 1) // PAGE_SIZE
+            page = 1
+            if pages > 1:
+                page = st.number_input(f"Страница (из {pages}):", min_value=1, max_value=pages, value=1)
+            page_df = df.iloc[(page - 1) * PAGE_SIZE:page * PAGE_SIZE]
+            st.dataframe(text_frame(page_df), use_container_width=True, height=300)
 
             st.subheader("Экспорт данных")
 
-            csv_data = df.to_csv(index=False, encoding='utf-8')
-            json_data = df.to_json(orient='records', force_ascii=False, indent=2)
-            xml_data = df_to_xml(df)
-            sql_data = df_to_sql(df)
-
-            export_cols = st.columns(4)
-
-            with export_cols[0]:
-                st.download_button(
-                    label="CSV",
-                    data=csv_data,
-                    file_name="test_data.csv",
-                    mime="text/csv",
-                    use_container_width=True
-                )
-
-            with export_cols[1]:
-                st.download_button(
-                    label="JSON",
-                    data=json_data,
-                    file_name="test_data.json",
-                    mime="application/json",
-                    use_container_width=True
-                )
-
-            with export_cols[2]:
-                st.download_button(
-                    label="XML",
-                    data=xml_data,
-                    file_name="test_data.xml",
-                    mime="application/xml",
-                    use_container_width=True
-                )
-
-            with export_cols[3]:
-                st.download_button(
-                    label="SQL",
-                    data=sql_data,
-                    file_name="test_data.sql",
-                    mime="text/plain",
-                    use_container_width=True
-                )
+            compress = st.selectbox("Сжатие файла:", DOWNLOAD_COMPRESSIONS)
+            compress = None if compress == DOWNLOAD_COMPRESSIONS[0] else compress
+            export_cols = st.columns(len(EXPORT_FORMATS))
+            for export_col, (label, (fmt, mime)) in zip(export_cols, EXPORT_FORMATS.items()):
+                with export_col:
+                    st.download_button(
+                        label=label,
+                        data=lazy_export(df, fmt, compress),
+                        file_name=compressed_name(f"test_data.{fmt}", compress),
+                        mime=FILE_COMPRESSIONS[compress][1] if compress else mime,
+                        use_container_width=True
+                    )
 
             st.subheader("Копировать в буфер")
-            copy_format = st.selectbox("Формат:", ["CSV", "JSON", "XML", "SQL"])
-
-            if copy_format == "CSV":
-                copy_data = csv_data
-            elif copy_format == "JSON":
-                copy_data = json_data
-            elif copy_format == "XML":
-                copy_data = xml_data
-            else:
-                copy_data = sql_data
-
-            st.code(copy_data[:500] + ("..." if len(copy_data) > 500 else ""), language='text')
+            copy_format = st.selectbox("Формат:", list(EXPORT_FORMATS))
+
+            copy_data = render_text(df.head(COPY_PREVIEW_ROWS), EXPORT_FORMATS[copy_format][0])
+            st.code(copy_data[:500] + ("..." if len(copy_data) > 500 or len(df) > COPY_PREVIEW_ROWS else ""),
+                    language='text')
             st.info("Выделите текст выше и скопируйте (Ctrl+C / Cmd+C)")
 
-            with st.expander("Полный просмотр данных"):
+            with st.expander("Просмотр страницы в формате экспорта"):
                 preview_format = st.radio("Формат просмотра:", ["JSON", "CSV", "XML", "SQL"], horizontal=True)
-                if preview_format == "JSON":
-                    st.code(json_data, language='json')
-                elif preview_format == "CSV":
-                    st.code(csv_data, language='csv')
-                elif preview_format == "XML":
-                    st.code(xml_data, language='xml')
-                else:
-                    st.code(sql_data, language='sql')
+                fmt = EXPORT_FORMATS[preview_format][0]
+                st.code(render_text(page_df, fmt), language=fmt)
 
         elif generate_button and not selected_types:
             st.warning("Пожалуйста, выберите хотя бы один тип данных")
@@ -530,10 +319,10 @@ with tabs[1]:
 
         with col_users:
             st.markdown("**Пользователи**")
-            st.dataframe(st.session_state['users_data'], use_container_width=True, height=300)
+            st.dataframe(text_frame(st.session_state['users_data']), use_container_width=True, height=300)
 
-            users_csv = st.session_state['users_data'].to_csv(index=False, encoding='utf-8')
-            users_json = st.session_state['users_data'].to_json(orient='records', force_ascii=False, indent=2)
+            users_csv = lazy_export(st.session_state['users_data'], 'csv')
+            users_json = lazy_export(st.session_state['users_data'], 'json')
 
             ucol1, ucol2 = st.columns(2)
             with ucol1:
@@ -543,10 +332,10 @@ with tabs[1]:
 
         with col_orders:
             st.markdown("**Заказы**")
-            st.dataframe(st.session_state['orders_data'], use_container_width=True, height=300)
+            st.dataframe(text_frame(st.session_state['orders_data']), use_container_width=True, height=300)
 
-            orders_csv = st.session_state['orders_data'].to_csv(index=False, encoding='utf-8')
-            orders_json = st.session_state['orders_data'].to_json(orient='records', force_ascii=False, indent=2)
+            orders_csv = lazy_export(st.session_state['orders_data'], 'csv')
+            orders_json = lazy_export(st.session_state['orders_data'], 'json')
 
             ocol1, ocol2 = st.columns(2)
             with ocol1:
@@ -577,8 +366,11 @@ CREATE TABLE orders (
 """
         st.code(sql_schema, language='sql')
 
-        combined_sql = sql_schema + "\n\n-- Данные пользователей\n" + df_to_sql(st.session_state['users_data'], 'users')
-        combined_sql += "\n\n-- Данные заказов\n" + df_to_sql(st.session_state['orders_data'], 'orders')
+        users_df, orders_df = st.session_state['users_data'], st.session_state['orders_data']
+
+        def combined_sql():
+            return (sql_schema + "\n\n-- Данные пользователей\n" + df_to_sql(users_df, 'users')
+                    + "\n\n-- Данные заказов\n" + df_to_sql(orders_df, 'orders'))
 
         st.download_button("Скачать SQL (схема + данные)", combined_sql, "related_data.sql", "text/plain",
                            use_container_width=True)
@@ -668,25 +460,37 @@ with tabs[2]:
         if st.button("Сгенерировать карту"):
             st.code(generate_bank_card())
 
+    st.markdown("**Проверка файла:**")
+    uploaded = st.file_uploader("CSV-файл или список значений (по одному на строку)", type=["csv", "txt"])
+    if uploaded is not None:
+        batch_kind = {"СНИЛС": "snils", "ИНН": "inn", "Банковская карта": "card"}[validation_type]
+        file_column = None
+        if uploaded.name.endswith(".csv"):
+            header = uploaded.getvalue().decode("utf-8").splitlines()[0].split(",")
+            default_index = header.index(validation_type) if validation_type in header else 0
+            file_column = st.selectbox("Колонка:", header, index=default_index)
+        summary = validators.validate_file(io.StringIO(uploaded.getvalue().decode("utf-8")), batch_kind, file_column)
+        sum_cols = st.columns(4)
+        sum_cols[0].metric("Всего", summary['total'])
+        sum_cols[1].metric("Валидных", summary['valid'])
+        sum_cols[2].metric("Неверная длина", summary['length'])
+        sum_cols[3].metric("Неверная контрольная сумма", summary['checksum'])
+
 with tabs[3]:
     st.subheader("Сохранённые шаблоны")
 
-    if st.session_state.templates:
+    if saved_templates:
         template_to_delete = None
-        template_names = list(st.session_state.templates.keys())
 
-        for name in template_names:
-            template = st.session_state.templates[name]
+        for name, template in saved_templates.items():
             with st.expander(f"📋 {name}"):
-                st.write(f"**Типы данных:** {', '.join(template['types'])}")
-                st.write(f"**Количество записей:** {template['count']}")
+                st.write(f"**Типы данных:** {', '.join(column['type'] for column in template['columns'])}")
+                st.write(f"**Количество записей:** {template['rows']}")
 
                 col_t1, col_t2 = st.columns(2)
                 with col_t1:
                     if st.button(f"Применить", key=f"apply_{name}"):
-                        data = {dtype: [DATA_TYPES[dtype]() for _ in range(template['count'])] for dtype in
-                                template['types']}
-                        df = pd.DataFrame(data)
+                        df = compile_template(template).dataframe(rows=min(template['rows'], MAX_RECORDS))
                         st.session_state['generated_data'] = df
                         st.session_state['generated'] = True
                         st.success("Данные сгенерированы! Перейдите на вкладку 'Генератор данных'")
@@ -695,11 +499,19 @@ with tabs[3]:
                         template_to_delete = name
 
         if template_to_delete:
-            del st.session_state.templates[template_to_delete]
+            delete_template(template_to_delete)
             st.rerun()
     else:
         st.info("Нет сохранённых шаблонов. Создайте шаблон на вкладке 'Генератор данных'")
 
+with st.expander("Статистика кэша"):
+    cache_stats = cache.stats()
+    cache_cols = st.columns(4)
+    cache_cols[0].metric("Записей", f"{cache_stats['entries']} / {cache_stats['max_entries']}")
+    cache_cols[1].metric("Объём, МБ", f"{cache_stats['bytes'] / 2 ** 20:.1f} / {cache_stats['max_bytes'] / 2 ** 20:.0f}")
+    cache_cols[2].metric("Попадания", f"{cache_stats['hit_rate']:.0%}")
+    cache_cols[3].metric("Вытеснения", cache_stats['evictions'])
+
 st.markdown("---")
 st.markdown("""
 <div style="text-align: center; color: #888; font-size: 0.9rem;">
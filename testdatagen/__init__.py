@@ -0,0 +1,14 @@
+# Тяжёлые модули (numpy, pandas, Faker) подгружаются только при обращении к атрибуту
+_EXPORTS = {
+    'DATA_TYPES': 'testdatagen.data_types',
+    'BATCH_GENERATORS': 'testdatagen.data_types',
+    'generate_column': 'testdatagen.engine',
+    'generate_dataframe': 'testdatagen.engine',
+}
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module 'testdatagen' has no attribute {name!r}")
+    from importlib import import_module
+    return getattr(import_module(_EXPORTS[name]), name)
@@ -0,0 +1,3 @@
+from testdatagen.cli import main
+
+raise SystemExit(main())
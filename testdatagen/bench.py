@@ -0,0 +1,209 @@
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+
+from testdatagen.fakers import seed_fakers
+
+BENCH_SEED = 20240101
+DEFAULT_ROWS = [1000, 10000]
+DEFAULT_REPEAT = 5
+# Разброс между запусками на одной машине доходит до 25–30%, поэтому порог выше него
+DEFAULT_THRESHOLD = 0.35
+DEFAULT_BASELINE = 'benchmarks/baseline.json'
+
+# Наборы колонок для экспортёров: чисто векторные, чисто Faker и смешанный
+COLUMN_MIXES = {
+    'документы': ['СНИЛС', 'ИНН (физлицо)', 'ИНН (юрлицо)', 'Банковская карта'],
+    'персональные': ['Полное имя (русское)', 'Email', 'Телефон (Россия)', 'Адрес (Россия)'],
+    'смешанный': ['СНИЛС', 'Полное имя (русское)', 'Дата рождения', 'UUID', 'Текст (предложение)'],
+}
+
+
+# Холодный старт: (имя, код, бюджет в секундах, модули, которые сценарий не должен загружать).
+# Код выполняется в свежем интерпретаторе, время считается от начала первого импорта
+STARTUP_CASES = [
+    ('cli', 'import testdatagen.cli', 0.05, ['numpy', 'pandas', 'faker', 'pyarrow']),
+    ('engine', 'import testdatagen.engine', 0.3, ['pandas', 'faker', 'pyarrow']),
+    ('server', 'import testdatagen.server', 0.5, ['pandas', 'faker', 'pyarrow']),
+    ('generate/СНИЛС', "from testdatagen.engine import generate_column; generate_column('СНИЛС', 10)", 0.3,
+     ['pandas', 'faker', 'pyarrow']),
+    ('generate/Имя (английское)',
+     "from testdatagen.engine import generate_column; generate_column('Имя (английское)', 10)", 0.6,
+     ['pandas', 'pyarrow']),
+]
+STARTUP_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+exec(sys.argv[1])
+seconds = time.perf_counter() - started
+print(json.dumps({'seconds': seconds, 'loaded': [m for m in json.loads(sys.argv[2]) if m in sys.modules]}))
+"""
+
+
+def reset_random():
+    seed_fakers(BENCH_SEED)
+    return np.random.default_rng(BENCH_SEED)
+
+
+def measure(func, repeat=DEFAULT_REPEAT):
+    # Время — все повторы без трассировки, пик памяти — отдельным прогоном под tracemalloc
+    # (учитываются аллокации Python и numpy; буферы Arrow в пул pyarrow сюда не попадают)
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - started)
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return times, peak
+
+
+def result(name, rows, times, peak):
+    # В отчёт идёт медиана повторов и их межквартильный разброс относительно медианы: compare не считает
+    # регрессией падение, которое укладывается в разброс
+    seconds = float(np.median(times))
+    low, high = np.percentile(times, [25, 75])
+    return {
+        'name': name,
+        'rows': rows,
+        'seconds': round(seconds, 6),
+        'repeat': len(times),
+        'spread': round(float(high - low) / seconds, 3) if seconds else 0,
+        'rows_per_sec': round(rows / seconds, 1) if seconds else None,
+        'us_per_row': round(seconds * 1e6 / rows, 3) if rows else None,
+        'peak_bytes': peak,
+    }
+
+
+def bench_generators(rows, types=None, repeat=DEFAULT_REPEAT):
+    from testdatagen.data_types import DATA_TYPES
+    from testdatagen.engine import column_generator
+
+    for dtype in types or DATA_TYPES:
+        generate = column_generator(dtype)
+        times, peak = measure(lambda: generate(rows, reset_random()), repeat)
+        yield result(f'generate/{dtype}', rows, times, peak)
+
+
+def bench_related(rows, repeat=DEFAULT_REPEAT):
+    from testdatagen.related import USERS_ORDERS_SCHEMA, generate_related
+
+    total = sum(len(df) for df in generate_related(USERS_ORDERS_SCHEMA, rows, seed=BENCH_SEED).values())
+    times, peak = measure(lambda: generate_related(USERS_ORDERS_SCHEMA, rows, seed=BENCH_SEED), repeat)
+    yield result('related/users_orders', total, times, peak)
+
+
+def bench_exporters(rows, repeat=DEFAULT_REPEAT):
+    from testdatagen.columns import text_frame
+    from testdatagen.engine import generate_dataframe
+    from testdatagen.exporters import df_to_sql, df_to_xml
+
+    exporters = {
+        'csv': lambda df: text_frame(df).to_csv(index=False),
+        'json': lambda df: text_frame(df).to_json(orient='records', force_ascii=False),
+        'xml': df_to_xml,
+        'sql': df_to_sql,
+        'sql-batch': lambda df: df_to_sql(df, batch_size=1000),
+    }
+    for mix, types in COLUMN_MIXES.items():
+        df = generate_dataframe(types, rows, reset_random())
+        for fmt, export in exporters.items():
+            times, peak = measure(lambda: export(df), repeat)
+            yield result(f'export/{fmt}/{mix}', rows, times, peak)
+
+
+def bench_startup(repeat=DEFAULT_REPEAT):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [root, os.environ.get('PYTHONPATH')])))
+    for name, code, budget, forbidden in STARTUP_CASES:
+        best, loaded = float('inf'), []
+        for _ in range(repeat):
+            output = subprocess.run([sys.executable, '-c', STARTUP_SCRIPT, code, json.dumps(forbidden)], env=env,
+                                    capture_output=True, text=True, check=True).stdout
+            run = json.loads(output)
+            best, loaded = min(best, run['seconds']), run['loaded']
+        yield {
+            'name': f'startup/{name}',
+            'seconds': round(best, 6),
+            'budget': budget,
+            'loaded': loaded,
+            'over_budget': best > budget or bool(loaded),
+        }
+
+
+SUITES = {
+    'generators': bench_generators,
+    'related': bench_related,
+    'exporters': bench_exporters,
+}
+
+
+def run_suite(rows_list=None, suites=None, types=None, repeat=DEFAULT_REPEAT, progress=None):
+    results = []
+    for rows in rows_list or DEFAULT_ROWS:
+        for suite in suites or SUITES:
+            cases = bench_generators(rows, types, repeat) if suite == 'generators' else SUITES[suite](rows, repeat)
+            for case in cases:
+                if progress:
+                    progress(case)
+                results.append(case)
+    return {'meta': environment(), 'results': results}
+
+
+def environment():
+    import pandas as pd
+
+    return {
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'seed': BENCH_SEED,
+    }
+
+
+def compare(report, baseline, threshold=DEFAULT_THRESHOLD):
+    # Регрессия — падение медианной пропускной способности больше чем на threshold относительно базовой
+    # линии и больше разброса повторов в обоих отчётах
+    previous = {(case['name'], case['rows']): case for case in baseline['results']}
+    rows = []
+    for case in report['results']:
+        old = previous.get((case['name'], case['rows']))
+        if old is None or not old['rows_per_sec'] or not case['rows_per_sec']:
+            continue
+        ratio = case['rows_per_sec'] / old['rows_per_sec']
+        allowed = max(threshold, case.get('spread', 0), old.get('spread', 0))
+        rows.append({
+            'name': case['name'],
+            'rows': case['rows'],
+            'baseline_rows_per_sec': old['rows_per_sec'],
+            'rows_per_sec': case['rows_per_sec'],
+            'ratio': round(ratio, 3),
+            'allowed': round(allowed, 3),
+            'regression': ratio < 1 - allowed,
+        })
+    return rows
+
+
+def load_report(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_report(report, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+        f.write('\n')
@@ -0,0 +1,121 @@
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+# Короткие строки используются как ключ напрямую, длинные заменяются дайджестом
+MAX_INLINE_KEY = 256
+
+
+def digest(data):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def fingerprint(value):
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, str):
+        return value if len(value) <= MAX_INLINE_KEY else ('str', digest(value.encode('utf-8')))
+    if isinstance(value, bytes):
+        return value if len(value) <= MAX_INLINE_KEY else ('bytes', digest(value))
+    if isinstance(value, (tuple, list)):
+        return tuple(fingerprint(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, fingerprint(v)) for k, v in value.items()))
+
+    import pandas as pd
+    if isinstance(value, pd.DataFrame):
+        from testdatagen.columns import KINDS_ATTR
+
+        # Хеш содержимого считается векторно, без сериализации всего фрейма. Виды колонок входят в ключ:
+        # от них зависит текст при экспорте, а по значениям и dtype их не отличить
+        h = hashlib.blake2b(digest_size=16)
+        h.update(pd.util.hash_pandas_object(value, index=False).to_numpy().tobytes())
+        h.update(repr([(str(col), str(dtype)) for col, dtype in value.dtypes.items()]).encode('utf-8'))
+        h.update(repr(sorted((value.attrs.get(KINDS_ATTR) or {}).items())).encode('utf-8'))
+        return ('DataFrame', value.shape, h.hexdigest())
+    raise TypeError(f'Нельзя построить ключ кэша для {type(value).__name__}')
+
+
+def estimate_size(value):
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    memory_usage = getattr(value, 'memory_usage', None)
+    if memory_usage is not None and hasattr(value, 'columns'):
+        return int(memory_usage(index=True, deep=True).sum())
+    return sys.getsizeof(value)
+
+
+class LRUCache:
+    # LRU-кэш с ограничением по числу записей и суммарному размеру значений
+
+    def __init__(self, max_entries=1024, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key][0]
+            self.misses += 1
+            return default
+
+    def put(self, key, value, size=None):
+        size = estimate_size(value) if size is None else size
+        if size > self.max_bytes:
+            return
+        with self.lock:
+            if key in self.entries:
+                self.bytes -= self.entries.pop(key)[1]
+            self.entries[key] = (value, size)
+            self.bytes += size
+            while len(self.entries) > self.max_entries or self.bytes > self.max_bytes:
+                _, (_, evicted_size) = self.entries.popitem(last=False)
+                self.bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self.entries),
+                'bytes': self.bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+    def memoize(self, func):
+        missing = object()
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                key = (func.__module__, func.__qualname__, fingerprint(args), fingerprint(kwargs))
+            except TypeError:
+                return func(*args, **kwargs)
+            result = self.get(key, missing)
+            if result is missing:
+                result = func(*args, **kwargs)
+                self.put(key, result)
+            return result
+
+        wrapper.cache = self
+        return wrapper
@@ -0,0 +1,490 @@
+import argparse
+import sys
+
+FORMATS = ['csv', 'json', 'ndjson', 'xml', 'sql', 'copy', 'parquet', 'arrow', 'arrow-stream', 'sqlite']
+COMPRESSIONS = {
+    'parquet': ['none', 'snappy', 'gzip', 'zstd', 'brotli', 'lz4'],
+    'arrow': ['none', 'lz4', 'zstd'],
+}
+DIALECTS = ['postgres', 'mysql', 'sqlite']
+FILE_COMPRESSIONS = ['gzip', 'zstd', 'xz']
+SIZE_UNITS = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+
+
+def add_output_arguments(parser):
+    parser.add_argument('--format', choices=FORMATS, default='csv', help='Формат вывода')
+    parser.add_argument('--table', default='test_data', help='Имя таблицы для форматов sql, copy и sqlite')
+    parser.add_argument('--dialect', choices=DIALECTS, default='postgres', help='Диалект SQL')
+    parser.add_argument('--sql-batch', type=int, default=1000,
+                        help='Количество строк в одном INSERT (ограничивается диалектом)')
+    parser.add_argument('--no-transaction', action='store_true',
+                        help='Не оборачивать SQL в BEGIN/COMMIT')
+    parser.add_argument('--compression',
+                        help='Сжатие для parquet (snappy, gzip, zstd, brotli, lz4) и arrow (lz4, zstd)')
+    parser.add_argument('--row-group-size', type=int,
+                        help='Размер row group в parquet и record batch в arrow (по умолчанию — размер чанка)')
+    parser.add_argument('--chunk-size', type=int, default=100_000, help='Размер чанка при потоковой записи')
+    parser.add_argument('--compress', choices=FILE_COMPRESSIONS,
+                        help='Сжать файл вывода целиком (сжатие идёт в пуле потоков параллельно с генерацией)')
+    parser.add_argument('--seed', type=int, help='Мастер-seed для воспроизводимой генерации')
+
+
+def add_profile_arguments(parser):
+    parser.add_argument('--profile', nargs='?', const='-', metavar='PATH',
+                        help="Отчёт о времени по стадиям: без значения — таблица в stderr, с путём — JSON-файл")
+    parser.add_argument('--metrics', metavar='PATH',
+                        help="Писать замеры стадий по мере выполнения в JSON Lines ('-' — stderr)")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='testdatagen', description='Генератор тестовых данных без интерфейса')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    generate = commands.add_parser('generate', help='Сгенерировать набор данных')
+    generate.add_argument('--types', required=True, help='Типы данных через запятую, например: СНИЛС,Email')
+    generate.add_argument('--rows', type=int, required=True, help='Количество записей')
+    generate.add_argument('--out', default='-', help="Файл для записи ('-' — стандартный вывод)")
+    add_output_arguments(generate)
+    add_profile_arguments(generate)
+    generate.add_argument('--workers', type=int, default=1, help='Количество процессов (0 — по числу ядер)')
+    generate.add_argument('--part-rows', type=int,
+                          help='Писать отдельные файлы частей по указанному числу записей')
+    generate.add_argument('--part-size',
+                          help='Начинать новую часть, когда несжатые данные части достигли размера (например, 500M, 2G)')
+    generate.add_argument('--unique', help='Типы данных (из --types), значения которых не должны повторяться')
+    generate.add_argument('--pool-dir',
+                          help='Каталог пулов готовых значений для медленных типов (адреса, тексты, компании)')
+    generate.add_argument('--pool-size', type=int, default=100_000,
+                          help='Размер пула уникальных значений при его создании')
+    generate.add_argument('--offset', type=int, default=0,
+                          help='Номер первой строки: с --seed выдаёт срез того же набора без генерации предыдущих строк')
+
+    generate.add_argument('--save-template', metavar='NAME',
+                          help='Сохранить параметры запуска как шаблон с указанным именем')
+    generate.add_argument('--template-dir', help='Каталог шаблонов (по умолчанию TESTDATAGEN_TEMPLATES или templates)')
+
+    run = commands.add_parser('run', help='Запустить сохранённый шаблон')
+    run.add_argument('template', help='Имя шаблона или путь к JSON-файлу')
+    run.add_argument('--template-dir', help='Каталог шаблонов (по умолчанию TESTDATAGEN_TEMPLATES или templates)')
+    run.add_argument('--rows', type=int, help='Переопределить количество записей')
+    run.add_argument('--seed', type=int, help='Переопределить seed')
+    run.add_argument('--start', type=int, default=0,
+                     help='Номер первой строки среза (по умолчанию --rows отсчитывается от неё до конца шаблона)')
+    run.add_argument('--out', default='-', help="Файл для записи ('-' — стандартный вывод)")
+    add_profile_arguments(run)
+
+    commands.add_parser('templates', help='Показать сохранённые шаблоны').add_argument(
+        '--template-dir', help='Каталог шаблонов (по умолчанию TESTDATAGEN_TEMPLATES или templates)')
+
+    related = commands.add_parser('related', help='Сгенерировать связанные таблицы по схеме')
+    related.add_argument('--schema', help='JSON-файл со схемой таблиц (по умолчанию — пользователи и заказы)')
+    related.add_argument('--rows', type=int, help='Количество записей в корневых таблицах')
+    related.add_argument('--out-dir', required=True, help='Каталог для файлов таблиц')
+    add_output_arguments(related)
+    add_profile_arguments(related)
+
+    validate = commands.add_parser('validate', help='Проверить СНИЛС, ИНН или номера карт в файле')
+    validate.add_argument('--kind', choices=['snils', 'inn', 'card'], required=True, help='Тип идентификатора')
+    validate.add_argument('--input', default='-', help="Файл для проверки ('-' — стандартный ввод)")
+    validate.add_argument('--column', help='Колонка CSV-файла (по умолчанию — одно значение на строку)')
+    validate.add_argument('--chunk-size', type=int, default=100_000, help='Размер чанка при чтении')
+
+    bench = commands.add_parser('bench', help='Замерить скорость генераторов и экспортёров')
+    bench.add_argument('--rows', default='1000,10000', help='Размеры наборов через запятую')
+    bench.add_argument('--suite', help='Наборы замеров через запятую: generators, related, exporters (по умолчанию все)')
+    bench.add_argument('--types', help='Ограничить замер генераторов указанными типами')
+    bench.add_argument('--repeat', type=int, default=5, help='Количество повторов, берётся медиана')
+    bench.add_argument('--out', default='-', help="JSON-отчёт ('-' — стандартный вывод)")
+    bench.add_argument('--baseline', help='Базовый отчёт для сравнения (например, benchmarks/baseline.json)')
+    bench.add_argument('--threshold', type=float, default=0.35,
+                       help='Допустимое падение пропускной способности относительно базового отчёта')
+    bench.add_argument('--save-baseline', metavar='PATH', help='Сохранить отчёт как новый базовый')
+    bench.add_argument('--startup', action='store_true',
+                       help='Замерить холодный старт (импорт и первый вызов) и сверить с бюджетом времени')
+
+    serve = commands.add_parser('serve', help='Запустить HTTP-сервис генерации (POST /generate)')
+    serve.add_argument('--host', default='127.0.0.1', help='Адрес для входящих соединений')
+    serve.add_argument('--port', type=int, default=8080, help='Порт')
+    serve.add_argument('--workers', type=int, default=0, help='Количество процессов генерации (0 — по числу ядер)')
+    serve.add_argument('--template-dir', help='Каталог шаблонов (по умолчанию TESTDATAGEN_TEMPLATES или templates)')
+    serve.add_argument('--pool-dir', help='Каталог пулов значений для колонок шаблонов с pool')
+
+    job = commands.add_parser('job', help='Долгая генерация частями с манифестом: продолжение после сбоя и дозапись')
+    job.add_argument('job_dir', help='Каталог задания: файлы частей и manifest.json')
+    job.add_argument('--template', help='Шаблон нового задания (имя или путь к JSON-файлу)')
+    job.add_argument('--template-dir', help='Каталог шаблонов (по умолчанию TESTDATAGEN_TEMPLATES или templates)')
+    job.add_argument('--types', help='Типы данных нового задания через запятую (вместо --template)')
+    job.add_argument('--format', choices=FORMATS, default='csv', help='Формат частей нового задания из --types')
+    job.add_argument('--rows', type=int,
+                     help='Общее число строк; для существующего задания — дописать части до этого числа')
+    job.add_argument('--seed', type=int, help='Мастер-seed нового задания (по умолчанию случайный)')
+    job.add_argument('--part-rows', type=int,
+                     help='Количество строк в одной части (по умолчанию 1 000 000); для существующего — в новых частях')
+    job.add_argument('--compress', choices=FILE_COMPRESSIONS, help='Сжатие файлов частей')
+    job.add_argument('--workers', type=int, default=1, help='Количество процессов (0 — по числу ядер)')
+    job.add_argument('--status', action='store_true', help='Показать состояние задания без генерации')
+    add_profile_arguments(job)
+
+    commands.add_parser('types', help='Показать доступные типы данных')
+    return parser
+
+
+def parse_types(value, parser):
+    from testdatagen.data_types import DATA_TYPES
+
+    types = [t.strip() for t in value.split(',') if t.strip()]
+    unknown = [t for t in types if t not in DATA_TYPES]
+    if unknown:
+        parser.error(f"неизвестные типы данных: {', '.join(unknown)}")
+    if not types:
+        parser.error('не указано ни одного типа данных')
+    return types
+
+
+def parse_size(value, parser):
+    value = value.strip().upper().removesuffix('B')
+    scale = SIZE_UNITS.get(value[-1:], 1)
+    try:
+        size = int(float(value[:-1] if value[-1:] in SIZE_UNITS else value) * scale)
+    except ValueError:
+        parser.error(f'некорректный размер: {value}')
+    if size < 1:
+        parser.error('размер части должен быть положительным')
+    return size
+
+
+def export_options(args):
+    options = format_options(args)
+    if args.compress:
+        options['compress'] = args.compress
+    return options
+
+
+def format_options(args):
+    if args.format == 'sql':
+        return {'table_name': args.table, 'batch_size': args.sql_batch, 'dialect': args.dialect,
+                'transaction': not args.no_transaction}
+    if args.format in ('copy', 'sqlite'):
+        return {'table_name': args.table}
+    if args.format == 'parquet':
+        return {'compression': args.compression or 'snappy', 'row_group_size': args.row_group_size}
+    if args.format in ('arrow', 'arrow-stream'):
+        compression = None if args.compression in (None, 'none') else args.compression
+        return {'compression': compression, 'row_group_size': args.row_group_size}
+    return {}
+
+
+def check_output_arguments(args, parser):
+    if args.chunk_size < 1:
+        parser.error('--chunk-size должно быть положительным числом')
+    if args.sql_batch < 1:
+        parser.error('--sql-batch должно быть положительным числом')
+    if args.compression is not None:
+        allowed = COMPRESSIONS.get('arrow' if args.format.startswith('arrow') else args.format)
+        if allowed is None:
+            parser.error(f'формат {args.format} не поддерживает --compression')
+        if args.compression not in allowed:
+            parser.error(f"сжатие для {args.format}: {', '.join(allowed)}")
+    if args.row_group_size is not None and args.row_group_size < 1:
+        parser.error('--row-group-size должно быть положительным числом')
+
+
+def run_generate(args, parser):
+    types = parse_types(args.types, parser)
+    if args.rows < 1:
+        parser.error('--rows должно быть положительным числом')
+    check_output_arguments(args, parser)
+    if args.format in ('parquet', 'arrow', 'sqlite') and args.out == '-':
+        parser.error(f'формат {args.format} требует --out')
+    if args.workers < 0:
+        parser.error('--workers не может быть отрицательным')
+    if args.part_rows is not None and (args.part_rows < 1 or args.out == '-'):
+        parser.error('--part-rows должно быть положительным числом и требует --out')
+    part_size = parse_size(args.part_size, parser) if args.part_size else None
+    if part_size and args.out == '-':
+        parser.error('--part-size требует --out')
+    if args.pool_size < 1:
+        parser.error('--pool-size должно быть положительным числом')
+    unique_types = parse_types(args.unique, parser) if args.unique else None
+    if unique_types:
+        if set(unique_types) - set(types):
+            parser.error('--unique может содержать только типы из --types')
+        # --part-rows и --part-size без процессов пишут части последовательно из одного потока чанков,
+        # поэтому индекс общий и уникальность сохраняется между частями; отказ нужен только для --workers
+        if args.workers != 1:
+            parser.error('--unique не совместим с --workers: индекс уникальности общий для всего набора')
+    if args.offset < 0:
+        parser.error('--offset не может быть отрицательным')
+    if args.offset and (args.seed is None or unique_types):
+        parser.error('--offset требует --seed и не совместим с --unique')
+    options = export_options(args)
+    if args.part_rows is not None:
+        options['part_rows'] = args.part_rows
+    if part_size:
+        options['part_size'] = part_size
+
+    if args.save_template:
+        save_generate_template(args, types, unique_types, options)
+
+    if args.pool_dir:
+        from testdatagen.pools import prepare_pools
+        prepare_pools(types, args.pool_dir, args.pool_size, args.seed)
+
+    if args.workers == 1:
+        from testdatagen.pipeline import export
+
+        try:
+            paths = export(types, args.rows, args.format, args.out, args.chunk_size, seed=args.seed,
+                           pool_dir=args.pool_dir, unique_types=unique_types, offset=args.offset, **options)
+        except ValueError as e:
+            parser.error(str(e))
+    else:
+        import random
+        from testdatagen.parallel import export_parallel
+
+        seed = args.seed if args.seed is not None else random.randrange(2 ** 32)
+        paths = export_parallel(types, args.rows, args.format, args.out, seed, args.workers or None, args.chunk_size,
+                                pool_dir=args.pool_dir, offset=args.offset, **options)
+    if args.part_rows is not None or part_size:
+        for path in paths:
+            print(path)
+    return 0
+
+
+def save_generate_template(args, types, unique_types, options):
+    from testdatagen.templates import DEFAULT_TEMPLATE_DIR, make_template, save_template
+
+    columns = [{'type': t, 'unique': t in (unique_types or []), 'pool': bool(args.pool_dir)} for t in types]
+    template = make_template(args.save_template, columns, args.rows, args.seed, args.format, options=options,
+                             chunk_size=args.chunk_size, pool_dir=args.pool_dir)
+    print(save_template(template, args.template_dir or DEFAULT_TEMPLATE_DIR), file=sys.stderr)
+
+
+def run_template(args, parser):
+    from testdatagen.templates import DEFAULT_TEMPLATE_DIR, compile_template, load_template
+
+    try:
+        plan = compile_template(load_template(args.template, args.template_dir or DEFAULT_TEMPLATE_DIR))
+    except (OSError, ValueError) as e:
+        parser.error(f'не удалось загрузить шаблон: {e}')
+    if args.rows is not None and args.rows < 0:
+        parser.error('--rows не может быть отрицательным')
+    if args.start < 0:
+        parser.error('--start не может быть отрицательным')
+    if plan.format in ('parquet', 'arrow', 'sqlite') and args.out == '-':
+        parser.error(f'формат {plan.format} требует --out')
+    rows = args.rows if args.rows is not None else max(plan.rows - args.start, 0)
+    try:
+        paths = plan.run(args.out, rows, args.seed, args.start)
+    except ValueError as e:
+        parser.error(str(e))
+    if 'part_rows' in plan.options or 'part_size' in plan.options:
+        for path in paths:
+            print(path)
+    return 0
+
+
+def run_templates(args):
+    from testdatagen.templates import DEFAULT_TEMPLATE_DIR, list_templates
+
+    for name, template in list_templates(args.template_dir or DEFAULT_TEMPLATE_DIR).items():
+        types = ', '.join(column['type'] for column in template['columns'])
+        print(f"{name}: {template['rows']} записей, {template['format']}: {types}")
+    return 0
+
+
+def run_related(args, parser):
+    if args.rows is not None and args.rows < 0:
+        parser.error('--rows не может быть отрицательным')
+    check_output_arguments(args, parser)
+
+    from testdatagen.related import USERS_ORDERS_SCHEMA, export_related
+
+    schema = USERS_ORDERS_SCHEMA
+    if args.schema:
+        import json
+        with open(args.schema, encoding='utf-8') as f:
+            schema = json.load(f)
+    options = export_options(args)
+    options.pop('table_name', None)
+    try:
+        paths = export_related(schema, args.format, args.out_dir, args.rows, args.chunk_size, args.seed, **options)
+    except ValueError as e:
+        parser.error(str(e))
+    for path in dict.fromkeys(paths.values()):
+        print(path)
+    return 0
+
+
+def run_job(args, parser):
+    import json
+    from testdatagen import jobs
+
+    try:
+        manifest = jobs.load_manifest(args.job_dir)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.status:
+        if manifest is None:
+            parser.error(f'в каталоге {args.job_dir} нет манифеста задания')
+        print(json.dumps(jobs.job_status(manifest), ensure_ascii=False))
+        return 0
+    if args.rows is not None and args.rows < 0:
+        parser.error('--rows не может быть отрицательным')
+    if args.workers < 0:
+        parser.error('--workers не может быть отрицательным')
+    if args.part_rows is not None and args.part_rows < 1:
+        parser.error('--part-rows должно быть положительным числом')
+    if manifest is None:
+        if bool(args.template) == bool(args.types):
+            parser.error('для нового задания нужен либо --template, либо --types')
+        try:
+            if args.template:
+                from testdatagen.templates import DEFAULT_TEMPLATE_DIR, load_template
+                template = load_template(args.template, args.template_dir or DEFAULT_TEMPLATE_DIR)
+            else:
+                from testdatagen.templates import make_template
+                if args.rows is None:
+                    parser.error('для нового задания из --types нужен --rows')
+                template = make_template('job', parse_types(args.types, parser), args.rows, fmt=args.format)
+            jobs.create_job(args.job_dir, template, args.rows, args.seed, args.part_rows or jobs.DEFAULT_PART_ROWS,
+                            args.compress)
+        except (OSError, ValueError) as e:
+            parser.error(f'не удалось создать задание: {e}')
+    elif args.template or args.types or args.seed is not None or args.compress:
+        parser.error('задание уже создано: его шаблон, seed и сжатие берутся из манифеста')
+
+    def progress(message, parts):
+        for part in parts:
+            print(f"{message}: строки {part['start']}–{part['start'] + part['rows'] - 1} ({part['path']})",
+                  file=sys.stderr)
+
+    try:
+        manifest = jobs.run_job(args.job_dir, args.rows, args.workers, progress, args.part_rows)
+    except ValueError as e:
+        parser.error(str(e))
+    print(json.dumps(jobs.job_status(manifest), ensure_ascii=False))
+    return 0
+
+
+def run_validate(args, parser):
+    import json
+    from testdatagen.validators import validate_file
+
+    if args.chunk_size < 1:
+        parser.error('--chunk-size должно быть положительным числом')
+    source = sys.stdin if args.input == '-' else args.input
+    summary = validate_file(source, args.kind, args.column, args.chunk_size)
+    print(json.dumps(summary, ensure_ascii=False))
+    return 1 if summary['invalid'] else 0
+
+
+def run_bench(args, parser):
+    import json
+    from testdatagen.bench import SUITES, bench_startup, compare, load_report, run_suite, save_report
+
+    try:
+        rows_list = [int(value) for value in args.rows.split(',')]
+    except ValueError:
+        parser.error('--rows должно быть списком чисел через запятую')
+    if min(rows_list) < 1 or args.repeat < 1:
+        parser.error('--rows и --repeat должны быть положительными числами')
+    suites = [s.strip() for s in args.suite.split(',')] if args.suite else None
+    if suites and set(suites) - set(SUITES):
+        parser.error(f'неизвестные наборы замеров: {", ".join(sorted(set(suites) - set(SUITES)))}')
+    types = parse_types(args.types, parser) if args.types else None
+
+    def progress(case):
+        print(f"{case['name']:<50} {case['rows']:>8} строк {case['rows_per_sec']:>14,.0f} строк/с "
+              f"{case['peak_bytes'] / 2 ** 20:>8.1f} МБ", file=sys.stderr)
+
+    report = run_suite(rows_list, suites, types, args.repeat, progress)
+    if args.startup:
+        report['startup'] = []
+        for case in bench_startup(args.repeat):
+            print(f"{case['name']:<50} {case['seconds'] * 1000:>8.1f} мс (бюджет {case['budget'] * 1000:.0f} мс)",
+                  file=sys.stderr)
+            report['startup'].append(case)
+    if args.baseline:
+        report['comparison'] = compare(report, load_report(args.baseline), args.threshold)
+    if args.out == '-':
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        save_report(report, args.out)
+    if args.save_baseline:
+        save_report({'meta': report['meta'], 'results': report['results']}, args.save_baseline)
+
+    regressions = [row for row in report.get('comparison', []) if row['regression']]
+    for row in regressions:
+        print(f"Регрессия: {row['name']} ({row['rows']} строк): {row['baseline_rows_per_sec']:,.0f} → "
+              f"{row['rows_per_sec']:,.0f} строк/с (допуск {row['allowed']:.0%})", file=sys.stderr)
+    over_budget = [case for case in report.get('startup', []) if case['over_budget']]
+    for case in over_budget:
+        loaded = f", загружены {', '.join(case['loaded'])}" if case['loaded'] else ''
+        print(f"Превышен бюджет старта: {case['name']}: {case['seconds'] * 1000:.1f} мс{loaded}", file=sys.stderr)
+    return 1 if regressions or over_budget else 0
+
+
+def run_serve(args, parser):
+    from testdatagen.server import run_server
+    from testdatagen.templates import DEFAULT_TEMPLATE_DIR
+
+    if args.workers < 0:
+        parser.error('--workers не может быть отрицательным')
+    run_server(args.host, args.port, args.workers or None, args.template_dir or DEFAULT_TEMPLATE_DIR, args.pool_dir)
+    return 0
+
+
+def run_types():
+    from testdatagen.data_types import DATA_TYPES
+    from testdatagen.engine import is_vectorized
+
+    for name in DATA_TYPES:
+        marker = ' [batch]' if is_vectorized(name) else ''
+        print(f'{name}{marker}')
+    return 0
+
+
+def run_profiled(command, args, parser):
+    if not args.profile and not args.metrics:
+        return command(args, parser)
+    import json
+    from testdatagen.profiling import format_report, json_lines, profiling
+
+    metrics = None
+    if args.metrics:
+        metrics = sys.stderr if args.metrics == '-' else open(args.metrics, 'w', encoding='utf-8')
+    try:
+        with profiling([json_lines(metrics)] if metrics else None) as profiler:
+            code = command(args, parser)
+    finally:
+        if metrics not in (None, sys.stderr):
+            metrics.close()
+    if args.profile == '-':
+        print(format_report(profiler.report()), file=sys.stderr)
+    elif args.profile:
+        with open(args.profile, 'w', encoding='utf-8') as f:
+            json.dump(profiler.report(), f, ensure_ascii=False, indent=2)
+    return code
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == 'generate':
+        return run_profiled(run_generate, args, parser)
+    if args.command == 'related':
+        return run_profiled(run_related, args, parser)
+    if args.command == 'validate':
+        return run_validate(args, parser)
+    if args.command == 'run':
+        return run_profiled(run_template, args, parser)
+    if args.command == 'templates':
+        return run_templates(args)
+    if args.command == 'bench':
+        return run_bench(args, parser)
+    if args.command == 'serve':
+        return run_serve(args, parser)
+    if args.command == 'job':
+        return run_profiled(run_job, args, parser)
+    return run_types()
@@ -0,0 +1,161 @@
+import numpy as np
+
+from testdatagen.generators import (
+    format_bank_card,
+    format_dates,
+    format_inn_company,
+    format_inn_individual,
+    format_iso_dates,
+    format_snils,
+    format_times,
+    format_uuids,
+)
+
+# Колонки хранятся в компактном виде (целые тела идентификаторов, datetime64, timedelta64,
+# 16-байтовые UUID, категории), а в текст превращаются только при экспорте.
+# Вид колонки записывается в df.attrs, его сохраняют срезы и pd.concat
+KINDS_ATTR = 'column_kinds'
+
+TYPE_KINDS = {
+    "СНИЛС": 'snils',
+    "ИНН (физлицо)": 'inn12',
+    "ИНН (юрлицо)": 'inn10',
+    "Банковская карта": 'card',
+    "Дата рождения": 'date',
+    "Дата (случайная)": 'date',
+    "Время": 'time',
+    "UUID": 'uuid',
+    "Город (Россия)": 'category',
+    "Город (США)": 'category',
+    "Должность": 'category',
+}
+
+
+def uuid_array(values):
+    import pandas as pd
+    import pyarrow as pa
+
+    raw = np.ascontiguousarray(np.asarray(values, dtype='S16'))
+    array = pa.FixedSizeBinaryArray.from_buffers(pa.binary(16), len(raw), [None, pa.py_buffer(raw)])
+    return pd.arrays.ArrowExtensionArray(array)
+
+
+def uuid_bytes(series):
+    import pyarrow as pa
+
+    array = pa.array(series.array)
+    if isinstance(array, pa.ChunkedArray):
+        array = array.combine_chunks()
+    data = np.frombuffer(array.buffers()[1], dtype=np.uint8)
+    return data[array.offset * 16:(array.offset + len(array)) * 16].view('S16')
+
+
+def category_array(values):
+    import pandas as pd
+
+    return values if isinstance(values, pd.Categorical) else pd.Categorical(np.asarray(values, dtype=object))
+
+
+STORAGE = {
+    'date': lambda values: np.asarray(values, dtype='datetime64[D]').astype('datetime64[s]'),
+    'time': lambda values: np.asarray(values, dtype='timedelta64[s]'),
+    'uuid': uuid_array,
+    'category': category_array,
+}
+
+# Форматтеры идентификаторов, дат и UUID отдают матрицу ASCII-байтов фиксированной ширины:
+# из неё строковая колонка Arrow собирается без промежуточных строк numpy
+FORMATTERS = {
+    'snils': lambda series: format_snils(series.to_numpy(), as_bytes=True),
+    'inn12': lambda series: format_inn_individual(series.to_numpy(), as_bytes=True),
+    'inn10': lambda series: format_inn_company(series.to_numpy(), as_bytes=True),
+    'card': lambda series: format_bank_card(series.to_numpy(), as_bytes=True),
+    'date': lambda series: format_dates(series.to_numpy().astype('datetime64[D]'), as_bytes=True),
+    'time': lambda series: format_times(series.to_numpy(), as_bytes=True),
+    'uuid': lambda series: format_uuids(uuid_bytes(series), as_bytes=True),
+}
+
+
+def ascii_array(matrix):
+    import pyarrow as pa
+
+    # large_string — то же хранение, что у строковых колонок pandas: обходится без приведения типа
+    count, width = matrix.shape
+    offsets = np.arange(0, (count + 1) * width, width, dtype=np.int64)
+    return pa.LargeStringArray.from_buffers(count, pa.py_buffer(offsets), pa.py_buffer(np.ascontiguousarray(matrix)))
+
+
+def ascii_column(matrix, index):
+    import pandas as pd
+
+    return pd.Series(ascii_array(matrix).to_pandas().array, index=index)
+
+
+def format_column(series, kind):
+    if kind == 'category':
+        return series.astype(str)
+    return ascii_column(FORMATTERS[kind](series), series.index)
+
+
+# SQL и COPY получают даты в ISO, остальные виды — в том же тексте, что и другие форматы
+def iso_column(series, kind):
+    if kind == 'date':
+        return ascii_column(format_iso_dates(series.to_numpy().astype('datetime64[D]'), as_bytes=True), series.index)
+    return format_column(series, kind)
+
+
+# Parquet и Arrow получают родные типы Arrow для дат (date32), времени (time32[s]) и UUID
+# (fixed_size_binary[16]). Идентификаторы — не числа: они пишутся тем же текстом, что и в остальных
+# форматах. Справочники — строками: словари у разных чанков разные, а файл Arrow IPC допускает один
+IDENTIFIER_KINDS = ['snils', 'inn12', 'inn10', 'card']
+
+
+def arrow_column(series, kind):
+    import pyarrow as pa
+
+    if kind in IDENTIFIER_KINDS:
+        return ascii_array(FORMATTERS[kind](series))
+    if kind == 'date':
+        return pa.array(series.to_numpy().astype('datetime64[D]'))
+    if kind == 'time':
+        return pa.array(series.to_numpy().astype(np.int32)).cast(pa.time32('s'))
+    if kind == 'category':
+        return pa.array(series.astype(str), from_pandas=True)
+    return pa.array(series, from_pandas=True)
+
+
+def type_kind(dtype):
+    return TYPE_KINDS.get(dtype)
+
+
+def build_frame(data, kinds, index=None):
+    # data: {колонка: значения генератора}, kinds: {колонка: вид или None}
+    import pandas as pd
+
+    kinds = {name: kind for name, kind in kinds.items() if kind is not None and name in data}
+    for name, kind in kinds.items():
+        if kind in STORAGE:
+            data[name] = STORAGE[kind](data[name])
+    df = pd.DataFrame(data, index=index)
+    if kinds:
+        df.attrs[KINDS_ATTR] = kinds
+    return df
+
+
+def arrow_table(df):
+    import pyarrow as pa
+
+    kinds = df.attrs.get(KINDS_ATTR) or {}
+    return pa.table({name: arrow_column(df[name], kinds.get(name)) for name in df.columns})
+
+
+def text_frame(df):
+    kinds = df.attrs.get(KINDS_ATTR)
+    if not kinds:
+        return df
+    out = df.copy(deep=False)
+    out.attrs = {}
+    for name, kind in kinds.items():
+        if name in out.columns:
+            out[name] = format_column(out[name], kind)
+    return out
@@ -0,0 +1,109 @@
+import io
+import shutil
+import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# Сжатие файлов вывода: поток режется на блоки, каждый блок сжимается в пуле потоков
+# в независимый член gzip, кадр zstd или поток xz. Склеенные блоки — корректный файл для
+# стандартных gzip, zstd и xz. zlib, lzma и zstd отпускают GIL, поэтому сжатие идёт
+# одновременно с генерацией и сериализацией следующих чанков
+FILE_COMPRESSIONS = {
+    'gzip': ('.gz', 'application/gzip'),
+    'zstd': ('.zst', 'application/zstd'),
+    'xz': ('.xz', 'application/x-xz'),
+}
+# Уровни — компромисс между скоростью и степенью сжатия: xz на уровне 6 медленнее генерации в разы
+COMPRESS_LEVELS = {'gzip': 6, 'zstd': 3, 'xz': 3}
+BLOCK_SIZE = 1024 * 1024
+# Потоков сжатия на один файл немного: при --workers такой пул есть в каждом процессе
+COMPRESS_WORKERS = 4
+
+
+def compress_block(data, method):
+    if method == 'gzip':
+        import gzip
+        return gzip.compress(data, compresslevel=COMPRESS_LEVELS['gzip'], mtime=0)
+    if method == 'xz':
+        import lzma
+        return lzma.compress(data, preset=COMPRESS_LEVELS['xz'])
+    if method == 'zstd':
+        # Стандартной библиотеке zstd неизвестен, кодек берётся из pyarrow
+        import pyarrow as pa
+        return pa.Codec('zstd', compression_level=COMPRESS_LEVELS['zstd']).compress(data, asbytes=True)
+    raise ValueError(f'Неизвестное сжатие: {method}')
+
+
+def compressed_name(path, method):
+    return path + FILE_COMPRESSIONS[method][0] if method else path
+
+
+class CompressedFile(io.RawIOBase):
+    # Бинарный приёмник для экспортёров: tell() возвращает объём несжатых данных
+    def __init__(self, out, method, workers=COMPRESS_WORKERS, block_size=BLOCK_SIZE):
+        super().__init__()
+        if method not in FILE_COMPRESSIONS:
+            raise ValueError(f"сжатие должно быть одним из: {', '.join(FILE_COMPRESSIONS)}")
+        self.own_file = isinstance(out, str) and out != '-'
+        self.file = open(out, 'wb') if self.own_file else sys.stdout.buffer if out == '-' else out
+        self.method = method
+        self.block_size = block_size
+        self.buffer = bytearray()
+        self.position = 0
+        self.size = 0
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+        self.max_pending = 2 * workers
+        self.pending = deque()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.buffer += data
+        self.position += len(data)
+        while len(self.buffer) >= self.block_size:
+            self.submit(bytes(self.buffer[:self.block_size]))
+            del self.buffer[:self.block_size]
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def submit(self, block):
+        self.pending.append(self.pool.submit(compress_block, block, self.method))
+        while len(self.pending) > self.max_pending:
+            self.write_ready()
+
+    def write_ready(self):
+        data = self.pending.popleft().result()
+        self.file.write(data)
+        self.size += len(data)
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            if self.buffer:
+                self.submit(bytes(self.buffer))
+                self.buffer.clear()
+            while self.pending:
+                self.write_ready()
+        finally:
+            self.pool.shutdown(cancel_futures=True)
+            if self.own_file:
+                self.file.close()
+            else:
+                self.file.flush()
+            super().close()
+
+
+def compress_file(source, out, method):
+    with open(source, 'rb') as src, CompressedFile(out, method) as dst:
+        shutil.copyfileobj(src, dst, BLOCK_SIZE)
+
+
+def compress_bytes(data, method):
+    buffer = io.BytesIO()
+    with CompressedFile(buffer, method) as sink:
+        sink.write(data)
+    return buffer.getvalue()
@@ -0,0 +1,87 @@
+from testdatagen.fakers import fake_en, fake_ru
+from testdatagen.generators import (
+    generate_ages,
+    generate_bank_card,
+    generate_bank_card_batch,
+    generate_bank_card_bodies,
+    generate_birth_date_batch,
+    generate_birth_dates,
+    generate_decade_date_batch,
+    generate_decade_dates,
+    generate_inn_company,
+    generate_inn_company_batch,
+    generate_inn_company_bodies,
+    generate_inn_individual,
+    generate_inn_individual_batch,
+    generate_inn_individual_bodies,
+    generate_snils,
+    generate_snils_batch,
+    generate_snils_bodies,
+    generate_time_batch,
+    generate_times,
+    generate_uuid_batch,
+    generate_uuids,
+)
+
+
+DATA_TYPES = {
+    "Имя (русское)": lambda: fake_ru().first_name(),
+    "Фамилия (русская)": lambda: fake_ru().last_name(),
+    "Полное имя (русское)": lambda: fake_ru().name(),
+    "Имя (английское)": lambda: fake_en().first_name(),
+    "Фамилия (английская)": lambda: fake_en().last_name(),
+    "Полное имя (английское)": lambda: fake_en().name(),
+    "Email": lambda: fake_en().email(),
+    "Телефон (Россия)": lambda: fake_ru().phone_number(),
+    "Телефон (США)": lambda: fake_en().phone_number(),
+    "Адрес (Россия)": lambda: fake_ru().address().replace('\n', ', '),
+    "Адрес (США)": lambda: fake_en().address().replace('\n', ', '),
+    "Город (Россия)": lambda: fake_ru().city(),
+    "Город (США)": lambda: fake_en().city(),
+    "Почтовый индекс": lambda: fake_ru().postcode(),
+    "Дата рождения": lambda: fake_ru().date_of_birth(minimum_age=18, maximum_age=80).strftime('%d.%m.%Y'),
+    "Возраст": lambda: fake_ru().random_int(18, 80),
+    "Дата (случайная)": lambda: fake_ru().date_this_decade().strftime('%d.%m.%Y'),
+    "Время": lambda: fake_ru().time(),
+    "Пароль (простой)": lambda: fake_en().password(length=8, special_chars=False),
+    "Пароль (сложный)": lambda: fake_en().password(length=16, special_chars=True, digits=True, upper_case=True),
+    "Компания": lambda: fake_ru().company(),
+    "Должность": lambda: fake_ru().job(),
+    "UUID": lambda: str(fake_en().uuid4()),
+    "IPv4 адрес": lambda: fake_en().ipv4(),
+    "URL": lambda: fake_en().url(),
+    "Номер карты (простой)": lambda: fake_en().credit_card_number(),
+    "Текст (предложение)": lambda: fake_ru().sentence(),
+    "Текст (абзац)": lambda: fake_ru().paragraph(nb_sentences=3),
+    "Логин": lambda: fake_en().user_name(),
+    "СНИЛС": generate_snils,
+    "ИНН (физлицо)": generate_inn_individual,
+    "ИНН (юрлицо)": generate_inn_company,
+    "Банковская карта": generate_bank_card,
+}
+
+# Колоночные генераторы: возвращают сразу всю колонку, лямбды выше — запасной путь
+BATCH_GENERATORS = {
+    "Дата рождения": generate_birth_date_batch,
+    "Дата (случайная)": generate_decade_date_batch,
+    "Время": generate_time_batch,
+    "UUID": generate_uuid_batch,
+    "СНИЛС": generate_snils_batch,
+    "ИНН (физлицо)": generate_inn_individual_batch,
+    "ИНН (юрлицо)": generate_inn_company_batch,
+    "Банковская карта": generate_bank_card_batch,
+}
+
+# Типизированные генераторы для DataFrame: значения в компактном виде, текст — при экспорте
+# (виды колонок и форматирование — в testdatagen.columns)
+TYPED_GENERATORS = {
+    "Дата рождения": generate_birth_dates,
+    "Возраст": generate_ages,
+    "Дата (случайная)": generate_decade_dates,
+    "Время": generate_times,
+    "UUID": generate_uuids,
+    "СНИЛС": generate_snils_bodies,
+    "ИНН (физлицо)": generate_inn_individual_bodies,
+    "ИНН (юрлицо)": generate_inn_company_bodies,
+    "Банковская карта": generate_bank_card_bodies,
+}
@@ -0,0 +1,55 @@
+import numpy as np
+
+from testdatagen.columns import build_frame, type_kind
+from testdatagen.data_types import BATCH_GENERATORS, DATA_TYPES, TYPED_GENERATORS
+from testdatagen.people import person_group, person_records
+from testdatagen.profiling import stage, timed
+
+
+# Выбор способа генерации колонки (пул, пакетный генератор или поштучная лямбда)
+# делается один раз; результат — функция (count, rng) -> колонка
+def column_generator(dtype, pool_dir=None):
+    return timed(f'column/{dtype}', select_generator(dtype, pool_dir))
+
+
+def select_generator(dtype, pool_dir=None):
+    if pool_dir is not None:
+        from testdatagen.pools import POOL_TYPES, pool_column
+        if dtype in POOL_TYPES:
+            return lambda count, rng=None: pool_column(dtype, count, pool_dir, rng)
+    batch = TYPED_GENERATORS.get(dtype) or BATCH_GENERATORS.get(dtype)
+    if batch is not None:
+        return batch
+    generate = DATA_TYPES[dtype]
+    return lambda count, rng=None: [generate() for _ in range(count)]
+
+
+def is_vectorized(dtype, pool_dir=None):
+    if pool_dir is not None:
+        from testdatagen.pools import POOL_TYPES
+        if dtype in POOL_TYPES:
+            return True
+    return dtype in TYPED_GENERATORS or dtype in BATCH_GENERATORS
+
+
+def generate_column(dtype, count, rng=None, pool_dir=None):
+    return column_generator(dtype, pool_dir)(count, rng)
+
+
+def generate_dataframe(types, count, rng=None, pool_dir=None, unique=None):
+    # unique: {тип: UniqueIndex} — индексы живут между чанками одного набора данных
+    rng = rng or np.random.default_rng()
+    unique = unique or {}
+    # Имена, email, логин и дату рождения, выбранные вместе, строит одна запись о человеке
+    records = person_records(person_group((dtype, dtype) for dtype in types if dtype not in unique), count, rng)
+    data = {}
+    for dtype in types:
+        if dtype in records:
+            data[dtype] = records[dtype]
+        elif dtype in unique:
+            from testdatagen.unique import unique_column
+            data[dtype] = unique_column(dtype, count, unique[dtype], rng, pool_dir)
+        else:
+            data[dtype] = generate_column(dtype, count, rng, pool_dir)
+    with stage('dataframe', count):
+        return build_frame(data, {dtype: type_kind(dtype) for dtype in types})
@@ -0,0 +1,333 @@
+import io
+import re
+import sys
+
+from testdatagen.columns import KINDS_ATTR, arrow_table, iso_column, text_frame
+from testdatagen.profiling import count_bytes, stage
+
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>'
+UNSAFE_NAME_CHARS = re.compile(r'[^\w]')
+
+
+def safe_name(name):
+    return UNSAFE_NAME_CHARS.sub('_', name)
+
+
+def column_text(series):
+    # Как str(value) при построчном экспорте: None -> 'None', NaN -> 'nan'
+    if series.dtype == object or series.hasnans:
+        return series._constructor(series.to_numpy(dtype=object).astype(str), index=series.index)
+    return series.astype(str)
+
+
+def escape_xml_column(series):
+    text = column_text(series)
+    return (text.str.replace('&', '&amp;', regex=False)
+            .str.replace('<', '&lt;', regex=False)
+            .str.replace('>', '&gt;', regex=False))
+
+
+# Записи собираются по колонкам целиком: имена тегов очищаются один раз на колонку,
+# экранирование и склейка тегов выполняются строковыми операциями над Series
+def xml_records(df, row_name="record"):
+    if df.empty:
+        return ''
+    df = text_frame(df)
+    records = f'  <{row_name}>'
+    for i, col in enumerate(df.columns):
+        tag = safe_name(col)
+        records = records + f'\n    <{tag}>' + escape_xml_column(df.iloc[:, i]) + f'</{tag}>'
+    records = records + f'\n  </{row_name}>'
+    return '\n'.join(records.tolist())
+
+
+def df_to_xml(df, root_name="data", row_name="record"):
+    xml_lines = [XML_HEADER, f'<{root_name}>']
+    records = xml_records(df, row_name)
+    if records:
+        xml_lines.append(records)
+    xml_lines.append(f'</{root_name}>')
+    return '\n'.join(xml_lines)
+
+
+# Ограничение числа строк в одном INSERT для каждого диалекта
+SQL_MAX_BATCH = {
+    'postgres': 10_000,
+    'mysql': 1_000,
+    'sqlite': 500,
+}
+
+
+# Типизированные литералы дат и времени; SQLite хранит их обычными строками в ISO
+SQL_TYPED_LITERALS = {
+    'postgres': {'date': 'DATE ', 'time': 'TIME '},
+    'mysql': {'date': 'DATE ', 'time': 'TIME '},
+    'sqlite': {},
+}
+
+
+def sql_literals(series, dialect='postgres', prefix=''):
+    import pandas as pd
+
+    nulls = series.isna()
+    if pd.api.types.is_bool_dtype(series.dtype):
+        text = series.map({True: 'TRUE', False: 'FALSE'})
+    elif pd.api.types.is_numeric_dtype(series.dtype):
+        text = series.astype(str)
+    else:
+        if pd.api.types.is_datetime64_any_dtype(series.dtype):
+            text = series.dt.strftime('%Y-%m-%d %H:%M:%S')
+        else:
+            text = column_text(series)
+        if dialect == 'mysql':
+            text = text.str.replace('\\', '\\\\', regex=False)
+        text = prefix + "'" + text.str.replace("'", "''", regex=False) + "'"
+    if nulls.any():
+        text = text.astype(object).where(~nulls, 'NULL')
+    return text
+
+
+def typed_columns(df):
+    # (колонка, вид) по позиции; типизированные колонки превращаются в текст с датами в ISO
+    kinds = df.attrs.get(KINDS_ATTR) or {}
+    for i, name in enumerate(df.columns):
+        kind = kinds.get(name)
+        series = df.iloc[:, i]
+        yield (series, None) if kind is None else (iso_column(series, kind), kind)
+
+
+def sql_value_rows(df, dialect='postgres'):
+    rows = None
+    for series, kind in typed_columns(df):
+        literals = sql_literals(series, dialect, SQL_TYPED_LITERALS.get(dialect, {}).get(kind, ''))
+        rows = literals if rows is None else rows + ', ' + literals
+    return ('(' + rows + ')').tolist()
+
+
+def df_to_sql(df, table_name="test_data", batch_size=1, dialect='postgres'):
+    if df.empty:
+        return ''
+    safe_table = safe_name(table_name)
+    columns = ', '.join(safe_name(col) for col in df.columns)
+    rows = sql_value_rows(df, dialect)
+    if batch_size <= 1:
+        return '\n'.join(f"INSERT INTO {safe_table} ({columns}) VALUES {row};" for row in rows)
+    batch_size = min(batch_size, SQL_MAX_BATCH.get(dialect, batch_size))
+    head = f"INSERT INTO {safe_table} ({columns}) VALUES\n"
+    return '\n'.join(head + ',\n'.join(rows[i:i + batch_size]) + ';' for i in range(0, len(rows), batch_size))
+
+
+def copy_fields(series):
+    import pandas as pd
+
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        text = series.dt.strftime('%Y-%m-%d %H:%M:%S')
+    elif pd.api.types.is_bool_dtype(series.dtype) or pd.api.types.is_numeric_dtype(series.dtype):
+        text = series.astype(str)
+    else:
+        text = (column_text(series).str.replace('\\', '\\\\', regex=False)
+                .str.replace('\t', '\\t', regex=False)
+                .str.replace('\n', '\\n', regex=False)
+                .str.replace('\r', '\\r', regex=False))
+    nulls = series.isna()
+    if nulls.any():
+        text = text.astype(object).where(~nulls, '\\N')
+    return text
+
+
+# Тело COPY ... FROM STDIN в текстовом формате PostgreSQL: поля через табуляцию, NULL как \N
+def copy_rows(df):
+    if df.empty:
+        return ''
+    rows = None
+    for series, _ in typed_columns(df):
+        fields = copy_fields(series)
+        rows = fields if rows is None else rows + '\t' + fields
+    return '\n'.join(rows.tolist()) + '\n'
+
+
+def copy_header(df, table_name="test_data"):
+    columns = ', '.join(safe_name(col) for col in df.columns)
+    return f"COPY {safe_name(table_name)} ({columns}) FROM STDIN;\n"
+
+
+def df_to_copy(df, table_name="test_data"):
+    return copy_header(df, table_name) + copy_rows(df) + '\\.\n'
+
+
+# Потоковые экспортёры: принимают итератор DataFrame-чанков и отдают текст по частям,
+# так что в памяти одновременно находится не больше одного чанка. Типизированные колонки
+# (см. testdatagen.columns) превращаются в текст здесь, на выходе
+def iter_csv(chunks):
+    header = True
+    for df in chunks:
+        yield text_frame(df).to_csv(index=False, header=header)
+        header = False
+
+
+def iter_json(chunks):
+    yield '['
+    first = True
+    for df in chunks:
+        if df.empty:
+            continue
+        body = text_frame(df).to_json(orient='records', force_ascii=False)[1:-1]
+        yield body if first else ',\n' + body
+        first = False
+    yield ']'
+
+
+def iter_ndjson(chunks):
+    for df in chunks:
+        if not df.empty:
+            yield text_frame(df).to_json(orient='records', lines=True, force_ascii=False)
+
+
+def iter_xml(chunks, root_name="data", row_name="record"):
+    yield f'{XML_HEADER}\n<{root_name}>\n'
+    for df in chunks:
+        records = xml_records(df, row_name)
+        if records:
+            yield records + '\n'
+    yield f'</{root_name}>'
+
+
+def write_xml(chunks, out, root_name="data", row_name="record"):
+    write_text(iter_xml(chunks, root_name, row_name), out)
+
+
+def iter_sql(chunks, table_name="test_data", batch_size=1, dialect='postgres', transaction=False):
+    if transaction:
+        yield 'BEGIN;\n'
+    for df in chunks:
+        if not df.empty:
+            yield df_to_sql(df, table_name, batch_size, dialect) + '\n'
+    if transaction:
+        yield 'COMMIT;\n'
+
+
+def iter_copy(chunks, table_name="test_data"):
+    header = None
+    for df in chunks:
+        if header is None:
+            header = copy_header(df, table_name)
+            yield header
+        yield copy_rows(df)
+    if header is not None:
+        yield '\\.\n'
+
+
+TEXT_EXPORTERS = {
+    'csv': iter_csv,
+    'json': iter_json,
+    'ndjson': iter_ndjson,
+    'xml': iter_xml,
+    'sql': iter_sql,
+    'copy': iter_copy,
+}
+
+
+def render_text(df, fmt, **options):
+    with stage(f'export/{fmt}', len(df)):
+        return ''.join(count_bytes(TEXT_EXPORTERS[fmt]([df], **options), f'export/{fmt}'))
+
+
+def write_text(pieces, out):
+    if out == '-':
+        out = sys.stdout
+    if isinstance(out, (io.RawIOBase, io.BufferedIOBase)):
+        # Бинарный приёмник (например, сжимающий): текст кодируется обёрткой, приёмник не закрывается
+        # write_through: каждый кусок сразу доходит до приёмника, и его tell() не отстаёт от записанного
+        text = io.TextIOWrapper(out, encoding='utf-8', newline='', write_through=True)
+        text.writelines(pieces)
+        text.detach()
+        return
+    if hasattr(out, 'write'):
+        out.writelines(pieces)
+        return
+    with open(out, 'w', encoding='utf-8', newline='') as f:
+        f.writelines(pieces)
+
+
+# Колоночные бинарные форматы: каждый чанк превращается в Arrow-таблицу со схемой первого чанка,
+# типизированные колонки сохраняют родные типы Arrow (см. testdatagen.columns.arrow_table)
+def arrow_tables(chunks):
+    schema = None
+    for df in chunks:
+        table = arrow_table(df)
+        if schema is None:
+            schema = table.schema
+        elif not table.schema.equals(schema):
+            table = table.cast(schema)
+        yield table
+
+
+# Без row_group_size таблицы копятся до размера чанка по умолчанию: мелкие куски (например, при делении
+# на части по размеру) не превращаются в мелкие row group
+PARQUET_ROW_GROUP_ROWS = 100_000
+
+
+def write_parquet(chunks, out, compression='snappy', row_group_size=None, chunk_groups=False):
+    # chunk_groups: каждый чанк пишется своей row group (части с ограничением по размеру сами режут чанки)
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    pending, pending_rows = [], 0
+    try:
+        for table in arrow_tables(chunks):
+            if writer is None:
+                writer = pq.ParquetWriter(out, table.schema, compression=compression or 'none')
+            pending.append(table)
+            pending_rows += table.num_rows
+            if chunk_groups or pending_rows >= (row_group_size or PARQUET_ROW_GROUP_ROWS):
+                writer.write_table(pa.concat_tables(pending), row_group_size=row_group_size)
+                pending, pending_rows = [], 0
+        if pending:
+            writer.write_table(pa.concat_tables(pending), row_group_size=row_group_size)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def write_arrow(chunks, out, compression=None, row_group_size=None, stream=False):
+    # Файловый IPC-формат Arrow совпадает с Feather V2; stream=True пишет потоковый IPC-формат
+    import pyarrow as pa
+
+    sink = sys.stdout.buffer if out == '-' else out
+    options = pa.ipc.IpcWriteOptions(compression=compression)
+    open_writer = pa.ipc.new_stream if stream else pa.ipc.new_file
+    writer = None
+    try:
+        for table in arrow_tables(chunks):
+            if writer is None:
+                writer = open_writer(sink, table.schema, options=options)
+            for batch in table.to_batches(max_chunksize=row_group_size):
+                writer.write_batch(batch)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def write_arrow_stream(chunks, out, compression=None, row_group_size=None):
+    write_arrow(chunks, out, compression, row_group_size, stream=True)
+
+
+FILE_EXTENSIONS = {
+    'csv': 'csv',
+    'json': 'json',
+    'ndjson': 'ndjson',
+    'xml': 'xml',
+    'sql': 'sql',
+    'copy': 'sql',
+    'parquet': 'parquet',
+    'arrow': 'arrow',
+    'arrow-stream': 'arrows',
+    'sqlite': 'db',
+}
+
+BINARY_EXPORTERS = {
+    'parquet': write_parquet,
+    'arrow': write_arrow,
+    'arrow-stream': write_arrow_stream,
+}
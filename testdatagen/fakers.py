@@ -0,0 +1,89 @@
+from functools import lru_cache
+
+LOCALES = {'ru': 'ru_RU', 'en': 'en_US'}
+
+# Провайдеры Faker подключаются по требованию: для метода создаётся экземпляр локали только с его
+# провайдером и теми, на чьи форматы он ссылается (адреса и компании — на person, email — ещё и на
+# date_time и company). Неизвестные методы (колонки 'faker' в связанных таблицах) получают полный набор
+PERSON = ['person']
+PROVIDER_METHODS = {
+    'first_name': PERSON,
+    'last_name': PERSON,
+    'name': PERSON,
+    'email': ['internet', 'person', 'date_time', 'company'],
+    'user_name': ['internet', 'person', 'date_time', 'company'],
+    'ipv4': ['internet', 'person', 'date_time', 'company'],
+    'url': ['internet', 'person', 'date_time', 'company'],
+    'phone_number': ['phone_number'],
+    'address': ['address', 'person'],
+    'city': ['address', 'person'],
+    'postcode': ['address', 'person'],
+    'date_of_birth': ['date_time'],
+    'date_this_decade': ['date_time'],
+    'time': ['date_time'],
+    'random_int': ['date_time'],
+    'password': ['misc'],
+    'uuid4': ['misc'],
+    'company': ['company', 'person'],
+    'job': ['job'],
+    'credit_card_number': ['credit_card'],
+    'sentence': ['lorem'],
+    'paragraph': ['lorem'],
+    'word': ['lorem'],
+}
+
+
+class LazyFaker:
+    # Экземпляры Faker на набор провайдеров создаются при первом вызове метода;
+    # seed запоминается и применяется и к тем, что появятся позже
+    def __init__(self, locale):
+        self.locale = locale
+        self.instances = {}
+        self.seed = None
+
+    def instance(self, providers):
+        fake = self.instances.get(providers)
+        if fake is None:
+            from faker import Faker
+            fake = Faker(self.locale, providers=providers and [f'faker.providers.{name}' for name in providers])
+            if self.seed is not None:
+                fake.seed_instance(self.seed)
+            self.instances[providers] = fake
+        return fake
+
+    def seed_instance(self, seed):
+        self.seed = seed
+        for fake in self.instances.values():
+            fake.seed_instance(seed)
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        providers = PROVIDER_METHODS.get(name)
+        attr = getattr(self.instance(tuple(providers) if providers else None), name)
+        # Следующие вызовы находят метод в __dict__ и не проходят через __getattr__;
+        # seed_instance пересеивает те же экземпляры, так что связанный метод остаётся верным
+        setattr(self, name, attr)
+        return attr
+
+
+@lru_cache(maxsize=None)
+def get_faker(locale):
+    return LazyFaker(LOCALES[locale])
+
+
+def get_fakers():
+    return get_faker('ru'), get_faker('en')
+
+
+def fake_ru():
+    return get_faker('ru')
+
+
+def fake_en():
+    return get_faker('en')
+
+
+def seed_fakers(seed):
+    for fake in get_fakers():
+        fake.seed_instance(seed)
@@ -0,0 +1,331 @@
+import random
+from datetime import date, timedelta
+
+import numpy as np
+
+
+def generate_snils():
+    digits = [random.randint(0, 9) for _ in range(9)]
+    checksum = sum((9 - i) * digits[i] for i in range(9))
+    if checksum < 100:
+        control = checksum
+    elif checksum == 100 or checksum == 101:
+        control = 0
+    else:
+        control = checksum % 101
+        if control == 100:
+            control = 0
+    digits_str = ''.join(map(str, digits))
+    return f"{digits_str[:3]}-{digits_str[3:6]}-{digits_str[6:9]} {control:02d}"
+
+
+def generate_inn_individual():
+    digits = [random.randint(0, 9) for _ in range(10)]
+    weights1 = [7, 2, 4, 10, 3, 5, 9, 4, 6, 8]
+    weights2 = [3, 7, 2, 4, 10, 3, 5, 9, 4, 6, 8]
+    n11 = sum(digits[i] * weights1[i] for i in range(10)) % 11 % 10
+    digits.append(n11)
+    n12 = sum(digits[i] * weights2[i] for i in range(11)) % 11 % 10
+    digits.append(n12)
+    return ''.join(map(str, digits))
+
+
+def generate_inn_company():
+    digits = [random.randint(0, 9) for _ in range(9)]
+    weights = [2, 4, 10, 3, 5, 9, 4, 6, 8]
+    n10 = sum(digits[i] * weights[i] for i in range(9)) % 11 % 10
+    digits.append(n10)
+    return ''.join(map(str, digits))
+
+
+def generate_bank_card():
+    prefixes = ['4', '51', '52', '53', '54', '55', '2200', '2201', '2202', '2203', '2204']
+    prefix = random.choice(prefixes)
+    remaining = 16 - len(prefix) - 1
+    digits = list(prefix) + [str(random.randint(0, 9)) for _ in range(remaining)]
+
+    def luhn_checksum(card_number):
+        def digits_of(n):
+            return [int(d) for d in str(n)]
+
+        digits_list = digits_of(card_number)
+        odd_digits = digits_list[-1::-2]
+        even_digits = digits_list[-2::-2]
+        checksum = sum(odd_digits)
+        for d in even_digits:
+            checksum += sum(digits_of(d * 2))
+        return checksum % 10
+
+    partial = ''.join(digits)
+    for check_digit in range(10):
+        if luhn_checksum(partial + str(check_digit)) == 0:
+            digits.append(str(check_digit))
+            break
+
+    card = ''.join(digits)
+    return f"{card[:4]} {card[4:8]} {card[8:12]} {card[12:16]}"
+
+
+# Пакетная генерация: вся колонка за один вызов через матрицу цифр
+SNILS_WEIGHTS = np.arange(9, 0, -1)
+INN12_WEIGHTS1 = np.array([7, 2, 4, 10, 3, 5, 9, 4, 6, 8])
+INN12_WEIGHTS2 = np.array([3, 7, 2, 4, 10, 3, 5, 9, 4, 6, 8])
+INN10_WEIGHTS = np.array([2, 4, 10, 3, 5, 9, 4, 6, 8])
+CARD_PREFIXES = ['4', '51', '52', '53', '54', '55', '2200', '2201', '2202', '2203', '2204']
+
+
+def format_digits(digits, pattern, alphabet=b'0123456789', raw=False):
+    # pattern вида '###-###-### ##': '#' заменяется очередной цифрой строки;
+    # raw=True возвращает матрицу ASCII-байтов (n, len(pattern)) без перевода в строки numpy.
+    # Алфавит — цифры 0–9 и, для шестнадцатеричных, идущие за ними подряд буквы: символы
+    # получаются сложением, разделители добавляются колонками справа, а строка собирается
+    # одной выборкой колонок
+    digits = np.asarray(digits)
+    count, slots = digits.shape
+    separators = sorted(set(pattern) - {'#'})
+    symbols = np.empty((count, slots + len(separators)), dtype=np.uint8)
+    symbols[:, :slots] = digits
+    symbols[:, :slots] += ord('0')
+    if len(alphabet) > 10:
+        symbols[:, :slots] += (digits > 9) * np.uint8(alphabet[10] - ord('9') - 1)
+    for i, ch in enumerate(separators):
+        symbols[:, slots + i] = ord(ch)
+    slot = iter(range(slots))
+    columns = [next(slot) if ch == '#' else slots + separators.index(ch) for ch in pattern]
+    out = np.take(symbols, columns, axis=1)
+    if raw:
+        return out
+    width = len(pattern)
+    return out.view(f'S{width}').ravel().astype(f'U{width}')
+
+
+def weighted_sum(digits, weights):
+    # Целочисленный matmul в numpy идёт без BLAS; суммы цифр малы, поэтому float32 считает их точно
+    return (np.asarray(digits, dtype=np.float32) @ weights.astype(np.float32)).astype(np.int64)
+
+
+def snils_control(digits):
+    return weighted_sum(digits, SNILS_WEIGHTS) % 101 % 100
+
+
+def inn12_controls(digits):
+    n11 = weighted_sum(digits[:, :10], INN12_WEIGHTS1) % 11 % 10
+    n12 = (weighted_sum(digits[:, :10], INN12_WEIGHTS2[:10]) + n11 * INN12_WEIGHTS2[10]) % 11 % 10
+    return n11, n12
+
+
+def inn10_control(digits):
+    return weighted_sum(digits[:, :9], INN10_WEIGHTS) % 11 % 10
+
+
+# Сумма цифр удвоенной цифры
+LUHN_DOUBLED = np.array([0, 2, 4, 6, 8, 1, 3, 5, 7, 9], dtype=np.int32)
+
+
+def luhn_check_digit(digits):
+    # Удваиваются цифры на чётных позициях справа, считая с 1 (контрольная цифра ещё не дописана)
+    reverse = np.asarray(digits)[:, ::-1]
+    total = LUHN_DOUBLED[reverse[:, ::2]].sum(axis=1) + reverse[:, 1::2].sum(axis=1, dtype=np.int32)
+    return (10 - total % 10) % 10
+
+
+# Типизированные колонки: хранится только «тело» идентификатора фиксированной ширины,
+# контрольные цифры и разделители добавляются при форматировании.
+# Цифры тела снимаются группами по четыре: остаток от деления на 10000 выбирает готовые
+# четыре цифры из таблицы, так что деление int64 выполняется один раз на группу, а не на цифру
+DIGIT_GROUPS = (np.arange(10000)[:, None] // np.array([1000, 100, 10, 1]) % 10).astype(np.uint8)
+DIGIT_GROUPS = DIGIT_GROUPS.view(np.uint32).ravel()
+
+
+def body_digits(bodies, width):
+    rest = np.asarray(bodies, dtype=np.int64)
+    groups = -(-width // 4)
+    index = np.empty((len(rest), groups), dtype=np.int64)
+    for i in range(groups - 1, -1, -1):
+        index[:, i] = rest % 10000
+        rest = rest // 10000
+    return np.take(DIGIT_GROUPS, index).view(np.uint8)[:, groups * 4 - width:]
+
+
+def generate_snils_bodies(n, rng=None):
+    rng = rng or np.random.default_rng()
+    return rng.integers(0, 10 ** 9, size=n, dtype=np.int32)
+
+
+def snils_digits(bodies):
+    digits = np.empty((len(bodies), 11), dtype=np.uint8)
+    digits[:, :9] = body_digits(bodies, 9)
+    control = snils_control(digits[:, :9])
+    digits[:, 9] = control // 10
+    digits[:, 10] = control % 10
+    return digits
+
+
+def format_snils(bodies, as_bytes=False):
+    return format_digits(snils_digits(bodies), '###-###-### ##', raw=as_bytes)
+
+
+def generate_inn_individual_bodies(n, rng=None):
+    rng = rng or np.random.default_rng()
+    return rng.integers(0, 10 ** 10, size=n, dtype=np.int64)
+
+
+def inn_individual_digits(bodies):
+    digits = np.empty((len(bodies), 12), dtype=np.uint8)
+    digits[:, :10] = body_digits(bodies, 10)
+    digits[:, 10], digits[:, 11] = inn12_controls(digits)
+    return digits
+
+
+def format_inn_individual(bodies, as_bytes=False):
+    return format_digits(inn_individual_digits(bodies), '#' * 12, raw=as_bytes)
+
+
+def generate_inn_company_bodies(n, rng=None):
+    rng = rng or np.random.default_rng()
+    return rng.integers(0, 10 ** 9, size=n, dtype=np.int32)
+
+
+def inn_company_digits(bodies):
+    digits = np.empty((len(bodies), 10), dtype=np.uint8)
+    digits[:, :9] = body_digits(bodies, 9)
+    digits[:, 9] = inn10_control(digits)
+    return digits
+
+
+def format_inn_company(bodies, as_bytes=False):
+    return format_digits(inn_company_digits(bodies), '#' * 10, raw=as_bytes)
+
+
+def generate_bank_card_bodies(n, rng=None):
+    # Тело карты — 15 цифр: префикс платёжной системы и случайный хвост
+    rng = rng or np.random.default_rng()
+    choice = rng.integers(0, len(CARD_PREFIXES), size=n)
+    prefixes = np.array([int(p) for p in CARD_PREFIXES], dtype=np.int64)[choice]
+    scales = 10 ** np.array([15 - len(p) for p in CARD_PREFIXES], dtype=np.int64)[choice]
+    return prefixes * scales + rng.integers(0, scales, dtype=np.int64)
+
+
+def bank_card_digits(bodies):
+    digits = np.empty((len(bodies), 16), dtype=np.uint8)
+    digits[:, :15] = body_digits(bodies, 15)
+    digits[:, 15] = luhn_check_digit(digits[:, :15])
+    return digits
+
+
+def format_bank_card(bodies, as_bytes=False):
+    return format_digits(bank_card_digits(bodies), '#### #### #### ####', raw=as_bytes)
+
+
+def generate_snils_batch(n, rng=None):
+    return format_snils(generate_snils_bodies(n, rng))
+
+
+def generate_inn_individual_batch(n, rng=None):
+    return format_inn_individual(generate_inn_individual_bodies(n, rng))
+
+
+def generate_inn_company_batch(n, rng=None):
+    return format_inn_company(generate_inn_company_bodies(n, rng))
+
+
+def generate_bank_card_batch(n, rng=None):
+    return format_bank_card(generate_bank_card_bodies(n, rng))
+
+
+def shift_years(day, years):
+    try:
+        return day.replace(year=day.year + years)
+    except ValueError:
+        return day.replace(year=day.year + years, day=28)
+
+
+def random_dates(start, end, n, rng):
+    start = np.datetime64(start, 'D')
+    span = (np.datetime64(end, 'D') - start).astype(np.int64) + 1
+    return start + rng.integers(0, span, size=n)
+
+
+def format_dates(days, as_bytes=False):
+    days = np.asarray(days, dtype='datetime64[D]')
+    months = days.astype('datetime64[M]')
+    day = (days - months).astype(np.int64) + 1
+    month = months.astype(np.int64) % 12 + 1
+    year = days.astype('datetime64[Y]').astype(np.int64) + 1970
+    # «ДДММ» и «ГГГГ» — по группе из таблицы цифр
+    digits = np.take(DIGIT_GROUPS, np.stack([day * 100 + month, year], axis=1)).view(np.uint8)
+    return format_digits(digits, '##.##.####', raw=as_bytes)
+
+
+def format_iso_dates(days, as_bytes=False):
+    # ГГГГ-ММ-ДД — для SQL и COPY, где ДД.ММ.ГГГГ зависит от настроек DateStyle
+    days = np.asarray(days, dtype='datetime64[D]')
+    months = days.astype('datetime64[M]')
+    day = (days - months).astype(np.int64) + 1
+    month = months.astype(np.int64) % 12 + 1
+    year = days.astype('datetime64[Y]').astype(np.int64) + 1970
+    digits = np.take(DIGIT_GROUPS, np.stack([year, month * 100 + day], axis=1)).view(np.uint8)
+    return format_digits(digits, '####-##-##', raw=as_bytes)
+
+
+def generate_birth_dates(n, rng=None):
+    rng = rng or np.random.default_rng()
+    today = date.today()
+    start = shift_years(today, -81) + timedelta(days=1)
+    return random_dates(start, shift_years(today, -18), n, rng)
+
+
+def generate_ages(n, rng=None):
+    rng = rng or np.random.default_rng()
+    return rng.integers(18, 81, size=n).astype(np.int16)
+
+
+def generate_decade_dates(n, rng=None):
+    rng = rng or np.random.default_rng()
+    today = date.today()
+    return random_dates(date(today.year - today.year % 10, 1, 1), today, n, rng)
+
+
+def generate_times(n, rng=None):
+    rng = rng or np.random.default_rng()
+    return rng.integers(0, 24 * 3600, size=n).astype('timedelta64[s]')
+
+
+def format_times(times, as_bytes=False):
+    seconds = np.asarray(times, dtype='timedelta64[s]').astype(np.int64)
+    hours, minutes, secs = seconds // 3600, seconds // 60 % 60, seconds % 60
+    digits = np.take(DIGIT_GROUPS, np.stack([hours, minutes * 100 + secs], axis=1)).view(np.uint8)[:, 2:]
+    return format_digits(digits, '##:##:##', raw=as_bytes)
+
+
+def generate_uuids(n, rng=None):
+    # 16 байт на значение (numpy S16); текстовый вид собирается в format_uuids
+    rng = rng or np.random.default_rng()
+    raw = rng.integers(0, 256, size=(n, 16), dtype=np.uint8)
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80
+    return raw.view('S16').ravel()
+
+
+def format_uuids(values, as_bytes=False):
+    raw = np.frombuffer(np.ascontiguousarray(values, dtype='S16').tobytes(), dtype=np.uint8).reshape(-1, 16)
+    nibbles = np.empty((len(raw), 32), dtype=np.uint8)
+    nibbles[:, 0::2] = raw >> 4
+    nibbles[:, 1::2] = raw & 0x0F
+    return format_digits(nibbles, '########-####-####-####-############', b'0123456789abcdef', raw=as_bytes)
+
+
+def generate_birth_date_batch(n, rng=None):
+    return format_dates(generate_birth_dates(n, rng))
+
+
+def generate_decade_date_batch(n, rng=None):
+    return format_dates(generate_decade_dates(n, rng))
+
+
+def generate_time_batch(n, rng=None):
+    return format_times(generate_times(n, rng))
+
+
+def generate_uuid_batch(n, rng=None):
+    return format_uuids(generate_uuids(n, rng))
@@ -0,0 +1,187 @@
+import json
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timezone
+
+from testdatagen.compression import compressed_name
+from testdatagen.exporters import FILE_EXTENSIONS
+from testdatagen.pipeline import write_output
+from testdatagen.templates import compile_template, normalize_template
+
+# Задание — набор файлов частей в одном каталоге и манифест с готовыми частями.
+# Строки адресуются по номеру (seed без уникальных колонок), поэтому любую часть можно
+# перегенерировать или дописать новые, не трогая уже записанные
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+DEFAULT_PART_ROWS = 1_000_000
+
+
+def now():
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
+def manifest_path(job_dir):
+    return os.path.join(job_dir, MANIFEST_NAME)
+
+
+def load_manifest(job_dir):
+    path = manifest_path(job_dir)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('version') != MANIFEST_VERSION:
+        raise ValueError(f"неподдерживаемая версия манифеста: {manifest.get('version')}")
+    return manifest
+
+
+def save_manifest(job_dir, manifest):
+    manifest['updated'] = now()
+    manifest['parts'].sort(key=lambda part: part['start'])
+    path = manifest_path(job_dir)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def part_name(start, fmt, compress=None):
+    # Номер первой строки в имени: порядок имён совпадает с порядком строк
+    return compressed_name(f'part-{start:012d}.{FILE_EXTENSIONS[fmt]}', compress)
+
+
+def create_job(job_dir, template, rows=None, seed=None, part_rows=DEFAULT_PART_ROWS, compress=None):
+    template = normalize_template(template)
+    if any(column['unique'] for column in template['columns']):
+        raise ValueError('задания не поддерживают уникальные колонки: их значения зависят от всех предыдущих строк')
+    if part_rows < 1:
+        raise ValueError('размер части должен быть положительным')
+    seed = template['seed'] if seed is None else seed
+    seed = random.randrange(2 ** 32) if seed is None else seed
+    # Части задание делит само; сжатие из опций шаблона применяется к каждой части
+    options = template['options']
+    compress = compress or options.pop('compress', None)
+    options.pop('part_rows', None)
+    options.pop('part_size', None)
+    template['seed'] = seed
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'created': now(),
+        'template': template,
+        'seed': seed,
+        'rows': template['rows'] if rows is None else rows,
+        'part_rows': part_rows,
+        'compress': compress,
+        'parts': [],
+    }
+    os.makedirs(job_dir, exist_ok=True)
+    save_manifest(job_dir, manifest)
+    return manifest
+
+
+def verify_parts(job_dir, manifest):
+    # Часть считается готовой, только если её файл на месте и размер совпадает с записанным
+    kept, dropped = [], []
+    for part in manifest['parts']:
+        path = os.path.join(job_dir, part['path'])
+        ok = os.path.exists(path) and os.path.getsize(path) == part['bytes']
+        (kept if ok else dropped).append(part)
+    manifest['parts'] = kept
+    return dropped
+
+
+def remove_temporary(job_dir):
+    for filename in os.listdir(job_dir):
+        if filename.startswith('part-') and '.tmp-' in filename:
+            os.remove(os.path.join(job_dir, filename))
+
+
+def plan_parts(manifest):
+    # Недостающие диапазоны строк: промежутки между готовыми частями и хвост до manifest['rows']
+    planned = []
+    position = 0
+
+    def fill(stop):
+        for start in range(position, stop, manifest['part_rows']):
+            planned.append((start, min(manifest['part_rows'], stop - start)))
+
+    for part in sorted(manifest['parts'], key=lambda part: part['start']):
+        fill(part['start'])
+        position = part['start'] + part['rows']
+    fill(manifest['rows'])
+    return planned
+
+
+def write_job_part(template, job_dir, start, count, seed, compress=None):
+    plan = compile_template(template)
+    name = part_name(start, plan.format, compress)
+    path = os.path.join(job_dir, name)
+    # Файл появляется под своим именем только целиком: прерванная запись остаётся во временном
+    tmp_path = f'{path}.tmp-{os.getpid()}'
+    write_output(plan.iter_chunks(count, seed, start), plan.format, tmp_path, compress=compress, **plan.options)
+    os.replace(tmp_path, path)
+    return {'start': start, 'rows': count, 'path': name, 'bytes': os.path.getsize(path), 'completed': now()}
+
+
+def covered_rows(manifest):
+    return max((part['start'] + part['rows'] for part in manifest['parts']), default=0)
+
+
+def run_job(job_dir, rows=None, workers=1, progress=None, part_rows=None):
+    manifest = load_manifest(job_dir)
+    if manifest is None:
+        raise ValueError(f'в каталоге {job_dir} нет манифеста задания')
+    if rows is not None:
+        if rows < covered_rows(manifest):
+            raise ValueError(f'на диске уже {covered_rows(manifest)} строк: число строк задания нельзя уменьшить')
+        manifest['rows'] = rows
+    if part_rows is not None:
+        # Размер влияет только на ещё не записанные части
+        manifest['part_rows'] = part_rows
+    remove_temporary(job_dir)
+    dropped = verify_parts(job_dir, manifest)
+    save_manifest(job_dir, manifest)
+    if progress and dropped:
+        progress('повреждённые или удалённые части будут записаны заново', dropped)
+
+    planned = plan_parts(manifest)
+    args = (manifest['template'], job_dir)
+
+    def done(part):
+        manifest['parts'].append(part)
+        save_manifest(job_dir, manifest)
+        if progress:
+            progress('часть записана', [part])
+
+    if workers == 1:
+        for start, count in planned:
+            done(write_job_part(*args, start, count, manifest['seed'], manifest['compress']))
+        return manifest
+    with ProcessPoolExecutor(max_workers=workers or None) as pool:
+        futures = [pool.submit(write_job_part, *args, start, count, manifest['seed'], manifest['compress'])
+                   for start, count in planned]
+        try:
+            for future in as_completed(futures):
+                done(future.result())
+        finally:
+            for future in futures:
+                future.cancel()
+    return manifest
+
+
+def job_status(manifest):
+    done_rows = sum(part['rows'] for part in manifest['parts'])
+    return {
+        'rows': manifest['rows'],
+        'done_rows': done_rows,
+        'parts': len(manifest['parts']),
+        'pending_parts': len(plan_parts(manifest)),
+        'bytes': sum(part['bytes'] for part in manifest['parts']),
+        'seed': manifest['seed'],
+        'format': manifest['template']['format'],
+        'compress': manifest['compress'],
+        'complete': done_rows == manifest['rows'],
+    }
@@ -0,0 +1,51 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from testdatagen.pipeline import (
+    DEFAULT_CHUNK_SIZE,
+    generate_rows,
+    iter_chunks,
+    part_path,
+    plan_chunks,
+    write_chunks,
+    write_output,
+)
+
+
+def iter_parallel_chunks(types, rows, seed, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, pool_dir=None, offset=0):
+    # Чанки возвращаются строго по порядку; вперёд запускается не больше 2 * workers задач,
+    # чтобы медленная запись не копила готовые чанки в памяти
+    workers = workers or os.cpu_count()
+    plan = plan_chunks(rows, chunk_size)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for _, start, count in plan:
+            pending.append(pool.submit(generate_rows, types, offset + start, offset + start + count, seed, pool_dir))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def write_part(types, fmt, path, start, count, seed, chunk_size, pool_dir, options):
+    # Часть — это диапазон строк общего набора: склеенные части совпадают с единым файлом
+    chunks = iter_chunks(types, count, chunk_size, seed=seed, pool_dir=pool_dir, offset=start)
+    write_chunks(chunks, fmt, path, **options)
+    return path
+
+
+def export_parallel(types, rows, fmt, out, seed, workers=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                    part_rows=None, pool_dir=None, offset=0, part_size=None, **options):
+    # Части по числу строк пишутся процессами пула целиком; при ограничении по размеру
+    # границы частей известны только во время записи, поэтому её ведёт основной процесс
+    if part_rows is None or part_size is not None:
+        chunks = iter_parallel_chunks(types, rows, seed, workers, chunk_size, pool_dir, offset)
+        return write_output(chunks, fmt, out, part_rows=part_rows, part_size=part_size, **options)
+
+    workers = workers or os.cpu_count()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(write_part, types, fmt, part_path(out, index), offset + start, count, seed,
+                               chunk_size, pool_dir, options)
+                   for index, start, count in plan_chunks(rows, part_rows)]
+        return [f.result() for f in futures]
@@ -0,0 +1,139 @@
+from datetime import date
+from functools import lru_cache
+
+import numpy as np
+
+from testdatagen.generators import generate_birth_dates
+from testdatagen.profiling import stage
+
+# Типы, которые строятся одной записью о человеке, если в наборе их выбрано два и больше:
+# пол у имени, фамилии и отчества общий, логин и email выводятся из имени и года рождения,
+# возраст считается по дате рождения
+PERSON_TYPES = [
+    "Имя (русское)",
+    "Фамилия (русская)",
+    "Полное имя (русское)",
+    "Email",
+    "Логин",
+    "Дата рождения",
+    "Возраст",
+]
+
+TRANSLIT = str.maketrans({
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'е': 'e', 'ё': 'e', 'ж': 'zh', 'з': 'z', 'и': 'i',
+    'й': 'y', 'к': 'k', 'л': 'l', 'м': 'm', 'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r', 'с': 's', 'т': 't',
+    'у': 'u', 'ф': 'f', 'х': 'kh', 'ц': 'ts', 'ч': 'ch', 'ш': 'sh', 'щ': 'shch', 'ъ': '', 'ы': 'y', 'ь': '',
+    'э': 'e', 'ю': 'yu', 'я': 'ya',
+})
+
+EMAIL_DOMAINS = np.array(['mail.ru', 'yandex.ru', 'gmail.com', 'rambler.ru', 'bk.ru', 'list.ru'], dtype=object)
+LOGIN_FORMATS = 5
+
+
+def translit(names):
+    return np.array([name.lower().translate(TRANSLIT) for name in names], dtype=object)
+
+
+@lru_cache(maxsize=None)
+def name_tables():
+    # Справочники имён берутся из данных провайдера Faker ru_RU, сам Faker при этом не создаётся.
+    # Для каждого пола: (имена, отчества, фамилии) и их транслитерация в том же порядке
+    from faker.providers.person.ru_RU import Provider
+
+    tables = {}
+    for gender in ('male', 'female'):
+        parts = [getattr(Provider, f'{part}_{gender}') for part in ('first_names', 'middle_names', 'last_names')]
+        tables[gender] = ([np.array(list(part), dtype=object) for part in parts],
+                          [translit(part) for part in parts])
+    return tables
+
+
+def person_group(columns):
+    # columns: [(имя колонки, тип)] -> {имя колонки: тип} для колонок общей записи;
+    # повторный тип в наборе остаётся независимой колонкой
+    group = {}
+    for name, dtype in columns:
+        if dtype in PERSON_TYPES and dtype not in group.values():
+            group[name] = dtype
+    return group if len(group) > 1 else {}
+
+
+def ages_at(birth_dates, today):
+    birth_dates = np.asarray(birth_dates, dtype='datetime64[D]')
+    years = birth_dates.astype('datetime64[Y]')
+    months = birth_dates.astype('datetime64[M]')
+    month = months.astype(np.int64) % 12 + 1
+    day = (birth_dates - months).astype(np.int64) + 1
+    before_birthday = month * 32 + day > today.month * 32 + today.day
+    return (today.year - 1970 - years.astype(np.int64) - before_birthday).astype(np.int16)
+
+
+def pick(tables, male, rng):
+    # Одна выборка индексов на часть имени и пол: кириллица и латиница берутся по одним индексам
+    count = len(male)
+    values = [np.empty(count, dtype=object) for _ in range(6)]
+    for gender, mask in (('male', male), ('female', ~male)):
+        size = int(mask.sum())
+        names, latin = tables[gender]
+        for i, part in enumerate(names):
+            index = rng.integers(0, len(part), size=size)
+            values[i][mask] = part[index]
+            values[i + 3][mask] = latin[i][index]
+    return values
+
+
+def make_logins(first, last, years, rng):
+    count = len(first)
+    formats = rng.integers(0, LOGIN_FORMATS, size=count)
+    numbers = rng.integers(1, 100, size=count)
+    logins = np.empty(count, dtype=object)
+    variants = [
+        lambda m: first[m] + '.' + last[m],
+        lambda m: last[m] + '.' + first[m],
+        lambda m: np.array([f[0] for f in first[m]], dtype=object) + last[m],
+        lambda m: first[m] + years[m].astype(str).astype(object),
+        lambda m: last[m] + '_' + numbers[m].astype(str).astype(object),
+    ]
+    for index, variant in enumerate(variants):
+        mask = formats == index
+        if mask.any():
+            logins[mask] = variant(mask)
+    return logins
+
+
+def generate_people(count, rng=None, types=PERSON_TYPES):
+    # Пакетная генерация записей: имена выбираются индексами по справочникам, строки
+    # собираются поэлементными операциями над массивами; возвращает {тип: колонка}
+    rng = rng or np.random.default_rng()
+    types = set(types)
+    male = rng.random(count) < 0.5
+    first, middle, last, first_lat, _, last_lat = pick(name_tables(), male, rng)
+    birth_dates = generate_birth_dates(count, rng)
+    people = {}
+    if "Имя (русское)" in types:
+        people["Имя (русское)"] = first
+    if "Фамилия (русская)" in types:
+        people["Фамилия (русская)"] = last
+    if "Полное имя (русское)" in types:
+        people["Полное имя (русское)"] = last + ' ' + first + ' ' + middle
+    if "Дата рождения" in types:
+        people["Дата рождения"] = birth_dates
+    if "Возраст" in types:
+        people["Возраст"] = ages_at(birth_dates, date.today())
+    if "Логин" in types or "Email" in types:
+        years = birth_dates.astype('datetime64[Y]').astype(np.int64) + 1970
+        logins = make_logins(first_lat, last_lat, years, rng)
+        if "Логин" in types:
+            people["Логин"] = logins
+        if "Email" in types:
+            people["Email"] = logins + '@' + EMAIL_DOMAINS[rng.integers(0, len(EMAIL_DOMAINS), size=count)]
+    return people
+
+
+def person_records(group, count, rng=None):
+    # group: {имя колонки: тип} из person_group -> {имя колонки: значения}
+    if not group:
+        return {}
+    with stage('record/person', count):
+        people = generate_people(count, rng, group.values())
+    return {name: people[dtype] for name, dtype in group.items()}
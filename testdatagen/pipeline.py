@@ -0,0 +1,230 @@
+import os
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+from testdatagen.compression import FILE_COMPRESSIONS, CompressedFile, compress_file
+from testdatagen.engine import column_generator, generate_dataframe, is_vectorized
+from testdatagen.exporters import BINARY_EXPORTERS, PARQUET_ROW_GROUP_ROWS, TEXT_EXPORTERS, write_text
+from testdatagen.fakers import seed_fakers
+from testdatagen.profiling import ChunkTimer, count_bytes, current_profiler
+from testdatagen.seeding import addressed_frame
+
+DEFAULT_CHUNK_SIZE = 100_000
+# При ограничении части по размеру чанк пишется кусками: размер проверяется между ними.
+# Первый кусок части — пробный, по нему оценивается объём строки
+PART_SLICE_ROWS = 10_000
+PART_PROBE_ROWS = 1_000
+
+
+# Каждый чанк получает собственный RNG из (seed, номер чанка), поэтому результат
+# не зависит от того, в каком процессе и в каком порядке чанки были сгенерированы
+def derive_seed(seed, index):
+    return int(np.random.SeedSequence([seed, index]).generate_state(1)[0])
+
+
+def chunk_rng(seed, index):
+    chunk_seed = derive_seed(seed, index)
+    seed_fakers(chunk_seed)
+    return np.random.default_rng(chunk_seed)
+
+
+def generate_chunk(types, count, seed=None, index=0, pool_dir=None, unique=None):
+    rng = None if seed is None else chunk_rng(seed, index)
+    return generate_dataframe(types, count, rng, pool_dir, unique)
+
+
+def plan_chunks(rows, chunk_size):
+    return [(index, start, min(chunk_size, rows - start))
+            for index, start in enumerate(range(0, rows, chunk_size))]
+
+
+def unique_indexes(unique_types, rows):
+    if not unique_types:
+        return None
+    from testdatagen.unique import UniqueIndex
+    return {dtype: UniqueIndex(dtype, rows) for dtype in unique_types}
+
+
+def seeded_columns(types, pool_dir=None):
+    return [(dtype, dtype, column_generator(dtype, pool_dir), is_vectorized(dtype, pool_dir)) for dtype in types]
+
+
+def generate_rows(types, start, stop, seed, pool_dir=None):
+    return addressed_frame(seeded_columns(types, pool_dir), start, stop, seed)
+
+
+def check_offset(offset, seed, unique_types):
+    if offset and (seed is None or unique_types):
+        raise ValueError('срез строк доступен только с seed и без уникальных колонок')
+
+
+# С seed и без уникальных колонок строки адресуются напрямую: результат не зависит
+# от размера чанка и числа процессов, а offset позволяет получить любой срез набора
+def iter_chunks(types, rows, chunk_size=DEFAULT_CHUNK_SIZE, rng=None, seed=None, pool_dir=None, unique_types=None,
+                offset=0):
+    check_offset(offset, seed, unique_types)
+    unique = unique_indexes(unique_types, rows)
+    if seed is not None and unique is None:
+        columns = seeded_columns(types, pool_dir)
+        for start in range(offset, offset + rows, chunk_size):
+            yield addressed_frame(columns, start, min(start + chunk_size, offset + rows), seed)
+        return
+    if seed is not None:
+        for index, _, count in plan_chunks(rows, chunk_size):
+            yield generate_chunk(types, count, seed, index, pool_dir, unique)
+        return
+    rng = rng or np.random.default_rng()
+    for start in range(0, rows, chunk_size):
+        yield generate_dataframe(types, min(chunk_size, rows - start), rng, pool_dir, unique)
+
+
+def resolve_writer(fmt):
+    if fmt in BINARY_EXPORTERS:
+        return BINARY_EXPORTERS[fmt]
+    if fmt == 'sqlite':
+        from testdatagen.sinks import write_sqlite
+        return write_sqlite
+    if fmt not in TEXT_EXPORTERS:
+        raise ValueError(f'Неизвестный формат: {fmt}')
+    exporter = TEXT_EXPORTERS[fmt]
+    return lambda chunks, out, **options: write_text(count_bytes(exporter(chunks, **options), f'export/{fmt}'), out)
+
+
+@contextmanager
+def output_target(fmt, out, compress=None):
+    # Куда писать экспортёру и как узнать объём уже записанных (несжатых) данных
+    if compress is None and fmt in TEXT_EXPORTERS and isinstance(out, str) and out != '-':
+        # Текст пишется в бинарный файл: tell() учитывает и байты в буфере, а размер на диске отстаёт
+        with open(out, 'wb') as sink:
+            yield sink, sink.tell
+        return
+    if compress is None:
+        yield out, lambda: os.path.getsize(out) if isinstance(out, str) and os.path.isfile(out) else 0
+        return
+    if fmt == 'sqlite':
+        # База SQLite пишется во временный файл и сжимается целиком после записи
+        tmp_path = f'{out}.tmp-{os.getpid()}'
+        try:
+            yield tmp_path, lambda: os.path.getsize(tmp_path) if os.path.exists(tmp_path) else 0
+            compress_file(tmp_path, out, compress)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return
+    with CompressedFile(out, compress) as sink:
+        yield sink, sink.tell
+
+
+def write_chunks(chunks, fmt, out, compress=None, **options):
+    with output_target(fmt, out, compress) as (target, _):
+        write_target(chunks, fmt, target, **options)
+
+
+def write_target(chunks, fmt, out, **options):
+    writer = resolve_writer(fmt)
+    profiler = current_profiler.get()
+    if profiler is None:
+        writer(chunks, out, **options)
+        return
+    # Время генерации чанков учитывается в стадиях колонок, в export/<формат> — только запись
+    chunks = ChunkTimer(chunks)
+    started = time.perf_counter()
+    writer(chunks, out, **options)
+    elapsed = time.perf_counter() - started - chunks.seconds
+    # Байты текстовых форматов считает count_bytes, бинарных — приёмник после закрытия writer
+    profiler.record(f'export/{fmt}', elapsed, chunks.rows, 0 if fmt in TEXT_EXPORTERS else written_bytes(out))
+
+
+def written_bytes(out):
+    # Размер файла или позиция бинарного приёмника; у сжимающего это несжатые байты, как и у текстовых форматов
+    if isinstance(out, str):
+        return os.path.getsize(out) if os.path.isfile(out) else 0
+    try:
+        return out.tell()
+    except (AttributeError, OSError, ValueError):
+        return 0
+
+
+def part_path(out, index):
+    # data.csv.gz -> data.part-00000.csv.gz
+    root, ext = os.path.splitext(out)
+    if ext in [suffix for suffix, _ in FILE_COMPRESSIONS.values()]:
+        root, inner = os.path.splitext(root)
+        ext = inner + ext
+    return f'{root}.part-{index:05d}{ext}'
+
+
+class Rollover:
+    # Делит поток чанков на части: часть заканчивается, когда набрала part_rows строк
+    # или когда следующая строка, по средней длине уже записанных, не уместится в part_size байт
+    def __init__(self, chunks, part_rows=None, part_size=None, slice_rows=PART_SLICE_ROWS):
+        self.chunks = iter(chunks)
+        self.part_rows = part_rows
+        self.part_size = part_size
+        self.slice_rows = slice_rows
+        self.pending = None
+
+    def has_rows(self):
+        while self.pending is None or not len(self.pending):
+            self.pending = next(self.chunks, None)
+            if self.pending is None:
+                return False
+        return True
+
+    def part(self, size):
+        rows = 0
+        while self.has_rows():
+            if self.part_rows and rows >= self.part_rows:
+                return
+            take = len(self.pending)
+            if self.part_rows:
+                take = min(take, self.part_rows - rows)
+            if self.part_size:
+                take = min(take, self.fitting_rows(rows, size()))
+                if take < 1:
+                    return
+            df, self.pending = self.pending.iloc[:take], self.pending.iloc[take:]
+            rows += take
+            yield df
+
+    def fitting_rows(self, rows, written):
+        if not rows:
+            return min(self.slice_rows, PART_PROBE_ROWS)
+        if not written:
+            return self.slice_rows
+        return min(self.slice_rows, (self.part_size - written) * rows // written)
+
+
+def write_parts(chunks, fmt, out, part_rows=None, part_size=None, compress=None, **options):
+    # Каждая часть — самостоятельный файл своего формата (с заголовком CSV, корнем XML и т. п.)
+    slice_rows = PART_SLICE_ROWS
+    if fmt == 'parquet' and part_size:
+        # Каждый кусок становится своей row group, и её размер подбирается по остатку лимита части:
+        # иначе часть закрывалась бы только после полной row group
+        slice_rows = options.get('row_group_size') or PARQUET_ROW_GROUP_ROWS
+        options = dict(options, chunk_groups=True)
+    rollover = Rollover(chunks, part_rows, part_size, slice_rows)
+    paths = []
+    while not paths or rollover.has_rows():
+        path = part_path(out, len(paths))
+        with output_target(fmt, path, compress) as (target, size):
+            write_target(rollover.part(size), fmt, target, **options)
+        paths.append(path)
+    return paths
+
+
+def write_output(chunks, fmt, out, compress=None, part_rows=None, part_size=None, **options):
+    if part_rows or part_size:
+        return write_parts(chunks, fmt, out, part_rows, part_size, compress, **options)
+    write_chunks(chunks, fmt, out, compress, **options)
+    return [out]
+
+
+def export(types, rows, fmt, out, chunk_size=DEFAULT_CHUNK_SIZE, rng=None, seed=None, pool_dir=None,
+           unique_types=None, offset=0, **options):
+    # Проверяем до открытия файла: iter_chunks — ленивый генератор
+    check_offset(offset, seed, unique_types)
+    chunks = iter_chunks(types, rows, chunk_size, rng, seed, pool_dir, unique_types, offset)
+    return write_output(chunks, fmt, out, **options)
@@ -0,0 +1,87 @@
+import os
+from functools import lru_cache
+
+import numpy as np
+
+from testdatagen.exporters import safe_name
+from testdatagen.pipeline import chunk_rng
+
+DEFAULT_POOL_SIZE = 100_000
+
+# Типы с медленными провайдерами Faker, для которых имеет смысл пул готовых значений
+POOL_TYPES = [
+    "Полное имя (русское)",
+    "Полное имя (английское)",
+    "Адрес (Россия)",
+    "Адрес (США)",
+    "Компания",
+    "Должность",
+    "Текст (предложение)",
+    "Текст (абзац)",
+]
+
+
+def pool_path(pool_dir, dtype):
+    return os.path.join(pool_dir, f'{safe_name(dtype)}.arrow')
+
+
+def build_pool(dtype, size=DEFAULT_POOL_SIZE, seed=None):
+    from testdatagen.engine import generate_column
+
+    # Генерация идёт раундами, пока не наберётся size уникальных значений
+    # или пока провайдер не перестанет выдавать новые
+    rng = chunk_rng(seed, 0) if seed is not None else np.random.default_rng()
+    values = {}
+    while len(values) < size:
+        before = len(values)
+        values.update(dict.fromkeys(generate_column(dtype, size - len(values), rng)))
+        if len(values) == before:
+            break
+    return list(values)
+
+
+def save_pool(values, path):
+    import pyarrow as pa
+
+    table = pa.table({'value': pa.array(values, type=pa.string())})
+    tmp_path = f'{path}.tmp-{os.getpid()}'
+    with pa.OSFile(tmp_path, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+    # Отображения прежних версий файлов больше не нужны
+    mapped_pool.cache_clear()
+
+
+def load_pool(path):
+    # Время изменения и размер входят в ключ кэша: пул, пересобранный другим процессом, загружается заново
+    stat = os.stat(path)
+    return mapped_pool(path, stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=None)
+def mapped_pool(path, mtime, size):
+    import pyarrow as pa
+
+    # Файл отображается в память: значения не копируются, страницы общие для всех процессов
+    source = pa.memory_map(path, 'r')
+    return pa.ipc.open_file(source).read_all().column('value').combine_chunks()
+
+
+def prepare_pools(types, pool_dir, size=DEFAULT_POOL_SIZE, seed=None):
+    os.makedirs(pool_dir, exist_ok=True)
+    for dtype in types:
+        if dtype in POOL_TYPES and not os.path.exists(pool_path(pool_dir, dtype)):
+            save_pool(build_pool(dtype, size, seed), pool_path(pool_dir, dtype))
+
+
+def sample_pool(pool, count, rng=None):
+    rng = rng or np.random.default_rng()
+    return pool.take(rng.integers(0, len(pool), size=count)).to_pandas()
+
+
+def pool_column(dtype, count, pool_dir, rng=None):
+    path = pool_path(pool_dir, dtype)
+    if not os.path.exists(path):
+        prepare_pools([dtype], pool_dir)
+    return sample_pool(load_pool(path), count, rng)
@@ -0,0 +1,128 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Профилировщик привязан к контексту: сессии Streamlit и параллельные запуски не смешивают замеры.
+# Без активного профилировщика хуки сводятся к одной проверке ContextVar
+current_profiler = ContextVar('current_profiler', default=None)
+
+
+class Profiler:
+    def __init__(self, listeners=None):
+        self.stages = {}
+        self.listeners = list(listeners or [])
+        self.started = time.perf_counter()
+        self.lock = threading.Lock()
+
+    def record(self, name, seconds=0.0, rows=0, nbytes=0, calls=1):
+        with self.lock:
+            stage = self.stages.setdefault(name, {'calls': 0, 'seconds': 0.0, 'rows': 0, 'bytes': 0})
+            stage['calls'] += calls
+            stage['seconds'] += seconds
+            stage['rows'] += rows
+            stage['bytes'] += nbytes
+        for listener in self.listeners:
+            listener(name, seconds, rows, nbytes)
+
+    def report(self):
+        elapsed = time.perf_counter() - self.started
+        with self.lock:
+            stages = [dict(stage, name=name) for name, stage in self.stages.items()]
+        for stage in stages:
+            stage['seconds'] = round(stage['seconds'], 6)
+            stage['rows_per_sec'] = round(stage['rows'] / stage['seconds'], 1) if stage['seconds'] else None
+            stage['share'] = round(stage['seconds'] / elapsed, 4) if elapsed else None
+        stages.sort(key=lambda stage: stage['seconds'], reverse=True)
+        return {'elapsed': round(elapsed, 6), 'stages': stages}
+
+
+@contextmanager
+def profiling(listeners=None):
+    profiler = Profiler(listeners)
+    token = current_profiler.set(profiler)
+    try:
+        yield profiler
+    finally:
+        current_profiler.reset(token)
+
+
+@contextmanager
+def stage(name, rows=0):
+    profiler = current_profiler.get()
+    if profiler is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profiler.record(name, time.perf_counter() - started, rows)
+
+
+def timed(name, generate):
+    # Обёртка генератора колонки (count, rng) -> колонка
+    def wrapper(count, rng=None):
+        profiler = current_profiler.get()
+        if profiler is None:
+            return generate(count, rng)
+        started = time.perf_counter()
+        values = generate(count, rng)
+        profiler.record(name, time.perf_counter() - started, count)
+        return values
+    return wrapper
+
+
+class ChunkTimer:
+    # Итератор чанков, который запоминает время их генерации: из времени writer оно вычитается,
+    # чтобы стадия экспорта показывала только сериализацию и запись
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.seconds = 0.0
+        self.rows = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        started = time.perf_counter()
+        try:
+            df = next(self.chunks)
+        finally:
+            self.seconds += time.perf_counter() - started
+        self.rows += len(df)
+        return df
+
+
+def count_bytes(pieces, name):
+    profiler = current_profiler.get()
+    if profiler is None:
+        yield from pieces
+        return
+    total = 0
+    try:
+        for piece in pieces:
+            total += len(piece.encode('utf-8'))
+            yield piece
+    finally:
+        profiler.record(name, nbytes=total, calls=0)
+
+
+def json_lines(stream):
+    # Слушатель для долгих задач: одна JSON-строка на каждый замер
+    def listener(name, seconds, rows, nbytes):
+        stream.write(json.dumps({'time': round(time.time(), 3), 'stage': name, 'seconds': round(seconds, 6),
+                                 'rows': rows, 'bytes': nbytes}, ensure_ascii=False) + '\n')
+        stream.flush()
+    return listener
+
+
+def format_report(report):
+    lines = [f"{'Стадия':<40} {'Вызовы':>8} {'Секунды':>10} {'Строки':>12} {'Строк/с':>14} {'Байты':>14}"]
+    for stage in report['stages']:
+        rate = f"{stage['rows_per_sec']:,.0f}" if stage['rows_per_sec'] else '-'
+        lines.append(f"{stage['name']:<40} {stage['calls']:>8} {stage['seconds']:>10.3f} {stage['rows']:>12} "
+                     f"{rate:>14} {stage['bytes']:>14}")
+    lines.append(f"Всего: {report['elapsed']:.3f} с")
+    return '\n'.join(lines)
@@ -0,0 +1,241 @@
+import contextvars
+import os
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import numpy as np
+
+from testdatagen.columns import build_frame, type_kind
+from testdatagen.compression import compress_file, compressed_name
+from testdatagen.engine import generate_column
+from testdatagen.exporters import FILE_EXTENSIONS
+from testdatagen.fakers import fake_en, fake_ru
+from testdatagen.generators import random_dates
+from testdatagen.people import person_group, person_records
+from testdatagen.pipeline import DEFAULT_CHUNK_SIZE, chunk_rng, write_chunks
+from testdatagen.profiling import stage
+
+# Декларативная схема: корневые таблицы задают 'rows', дочерние — 'parent' с внешним ключом
+# и распределением количества дочерних записей на одного родителя
+USERS_ORDERS_SCHEMA = {
+    'users': {
+        'rows': 5,
+        'key': 'user_id',
+        'columns': {
+            'name': 'Полное имя (русское)',
+            'email': 'Email',
+            'phone': 'Телефон (Россия)',
+            'registration_date': {'date': 'this_year'},
+        },
+    },
+    'orders': {
+        'key': 'order_id',
+        'parent': {'table': 'users', 'column': 'user_id', 'cardinality': {'uniform': [1, 3]}},
+        'columns': {
+            'product': {'faker': 'word', 'capitalize': True},
+            'amount': {'uniform': [100, 10000], 'round': 2},
+            'order_date': {'date': 'this_month'},
+            'status': {'choice': ['Новый', 'В обработке', 'Отправлен', 'Доставлен']},
+        },
+    },
+}
+
+
+def draw_counts(spec, n, rng):
+    if 'fixed' in spec:
+        return np.full(n, spec['fixed'], dtype=np.int64)
+    if 'uniform' in spec:
+        low, high = spec['uniform']
+        return rng.integers(low, high + 1, size=n)
+    if 'poisson' in spec:
+        counts = rng.poisson(spec['poisson'], size=n)
+        return np.clip(counts, spec.get('min', 0), spec.get('max'))
+    raise ValueError(f'Неизвестное распределение количества записей: {spec!r}')
+
+
+def date_bounds(value):
+    today = date.today()
+    if value == 'this_year':
+        return date(today.year, 1, 1), today
+    if value == 'this_month':
+        return date(today.year, today.month, 1), today
+    start, end = value
+    return date.fromisoformat(start), date.fromisoformat(end)
+
+
+def generate_values(spec, n, rng):
+    if callable(spec):
+        return spec(n, rng)
+    if isinstance(spec, str):
+        return generate_column(spec, n, rng)
+    if 'choice' in spec:
+        values = np.asarray(spec['choice'])
+        weights = spec.get('weights')
+        if weights is not None:
+            weights = np.asarray(weights, dtype=float) / np.sum(weights)
+        codes = rng.choice(len(values), size=n, p=weights)
+        if len(set(spec['choice'])) < len(values):
+            return values[codes]
+        # Категории фиксированы схемой, поэтому чанки склеиваются без потери типа
+        import pandas as pd
+        return pd.Categorical.from_codes(codes, categories=values)
+    if 'uniform' in spec:
+        low, high = spec['uniform']
+        values = rng.uniform(low, high, size=n)
+        return values.round(spec['round']) if 'round' in spec else values
+    if 'date' in spec:
+        start, end = date_bounds(spec['date'])
+        return random_dates(start, end, n, rng)
+    if 'faker' in spec:
+        fake = fake_en() if spec.get('locale') == 'en' else fake_ru()
+        method = getattr(fake, spec['faker'])
+        values = [method() for _ in range(n)]
+        return [v.capitalize() for v in values] if spec.get('capitalize') else values
+    raise ValueError(f'Неизвестное описание колонки: {spec!r}')
+
+
+def spec_kind(spec):
+    if isinstance(spec, str):
+        return type_kind(spec)
+    if isinstance(spec, dict) and 'choice' in spec:
+        return 'category'
+    if isinstance(spec, dict) and 'date' in spec:
+        return 'date'
+    return None
+
+
+def table_children(schema):
+    children = {name: [] for name in schema}
+    roots = []
+    for name, table in schema.items():
+        parent = table.get('parent')
+        if parent is None:
+            roots.append(name)
+            continue
+        if parent['table'] not in schema:
+            raise ValueError(f"Таблица {name} ссылается на неизвестную таблицу {parent['table']}")
+        if 'key' not in schema[parent['table']]:
+            raise ValueError(f"У родительской таблицы {parent['table']} не задан ключ 'key'")
+        children[parent['table']].append(name)
+
+    reachable = set()
+    pending = list(roots)
+    while pending:
+        name = pending.pop()
+        reachable.add(name)
+        pending.extend(children[name])
+    if len(reachable) != len(schema):
+        raise ValueError(f"Циклические ссылки в схеме: {', '.join(sorted(set(schema) - reachable))}")
+    return roots, children
+
+
+def build_table(table, keys, parent_keys, rng):
+    data = {}
+    if 'key' in table:
+        data[table['key']] = keys
+    if parent_keys is not None:
+        data[table['parent']['column']] = parent_keys
+    group = person_group((column, spec) for column, spec in table['columns'].items() if isinstance(spec, str))
+    records = person_records(group, len(keys), rng)
+    for column, spec in table['columns'].items():
+        data[column] = records[column] if column in records else generate_values(spec, len(keys), rng)
+    with stage('dataframe', len(keys)):
+        return build_frame(data, {column: spec_kind(spec) for column, spec in table['columns'].items()})
+
+
+# Генерация идёт чанками корневой таблицы: для каждого чанка дочерние строки строятся
+# векторно через np.repeat по массиву ключей родителей, ключи выдаются сквозными счётчиками
+def iter_related(schema, rows=None, chunk_size=DEFAULT_CHUNK_SIZE, rng=None, seed=None):
+    roots, children = table_children(schema)
+    next_key = {name: 1 for name in schema}
+    if rng is None and seed is None:
+        rng = np.random.default_rng()
+
+    def emit(name, count, parent_keys, rng):
+        keys = np.arange(next_key[name], next_key[name] + count)
+        next_key[name] += count
+        yield name, build_table(schema[name], keys, parent_keys, rng)
+        for child in children[name]:
+            parent = schema[child]['parent']
+            counts = draw_counts(parent.get('cardinality', {'fixed': 1}), count, rng)
+            yield from emit(child, int(counts.sum()), np.repeat(keys, counts), rng)
+
+    chunk_index = 0
+    for root in roots:
+        total = rows if rows is not None else schema[root].get('rows', 0)
+        for start in range(0, total, chunk_size):
+            chunk_rows = min(chunk_size, total - start)
+            yield from emit(root, chunk_rows, None, rng if seed is None else chunk_rng(seed, chunk_index))
+            chunk_index += 1
+
+
+def generate_related(schema, rows=None, chunk_size=DEFAULT_CHUNK_SIZE, rng=None, seed=None):
+    import pandas as pd
+
+    parts = {name: [] for name in schema}
+    for name, df in iter_related(schema, rows, chunk_size, rng, seed):
+        parts[name].append(df)
+    return {name: pd.concat(dfs, ignore_index=True) if dfs else pd.DataFrame()
+            for name, dfs in parts.items()}
+
+
+def generate_related_data(count):
+    tables = generate_related(USERS_ORDERS_SCHEMA, rows=count)
+    return tables['users'], tables['orders']
+
+
+def queue_chunks(chunks):
+    while True:
+        df = chunks.get()
+        if df is None:
+            return
+        yield df
+
+
+# Каждая таблица пишется своим потоком из ограниченной очереди, поэтому
+# в памяти держится не больше нескольких чанков на таблицу
+def export_related(schema, fmt, out_dir, rows=None, chunk_size=DEFAULT_CHUNK_SIZE, seed=None, compress=None,
+                   **options):
+    os.makedirs(out_dir, exist_ok=True)
+    # Для sqlite все таблицы попадают в одну базу, чтобы внешние ключи оставались в одном файле;
+    # её сжимаем целиком после записи всех таблиц
+    paths = {name: os.path.join(out_dir, f"{'data' if fmt == 'sqlite' else name}.{FILE_EXTENSIONS[fmt]}")
+             for name in schema}
+    if compress is not None and fmt != 'sqlite':
+        paths = {name: compressed_name(path, compress) for name, path in paths.items()}
+        options['compress'] = compress
+    queues = {name: queue.Queue(maxsize=2) for name in schema}
+
+    with ThreadPoolExecutor(max_workers=len(schema)) as pool:
+        futures = {}
+        for name in schema:
+            table_options = dict(options, table_name=name) if fmt in ('sql', 'copy', 'sqlite') else options
+            # Контекст копируется, чтобы запись таблиц попала в активный профилировщик
+            futures[name] = pool.submit(contextvars.copy_context().run, write_chunks, queue_chunks(queues[name]),
+                                        fmt, paths[name], **table_options)
+
+        def put(name, item):
+            while True:
+                try:
+                    queues[name].put(item, timeout=1)
+                    return
+                except queue.Full:
+                    if futures[name].done():
+                        futures[name].result()
+
+        try:
+            for name, df in iter_related(schema, rows, chunk_size, seed=seed):
+                put(name, df)
+        finally:
+            for name in schema:
+                if not futures[name].done():
+                    put(name, None)
+        for future in futures.values():
+            future.result()
+    if compress is not None and fmt == 'sqlite':
+        database = next(iter(paths.values()))
+        compress_file(database, compressed_name(database, compress), compress)
+        os.remove(database)
+        paths = {name: compressed_name(path, compress) for name, path in paths.items()}
+    return paths
@@ -0,0 +1,78 @@
+import hashlib
+
+import numpy as np
+
+from testdatagen.columns import build_frame, type_kind
+from testdatagen.fakers import seed_fakers
+from testdatagen.people import person_group, person_records
+from testdatagen.profiling import stage
+
+# Строки адресуются блоками фиксированного размера: случайность блока определяется только
+# (seed, колонка, номер блока), поэтому строку i можно получить, не генерируя предыдущие
+ROW_BLOCK_SIZE = 4096
+UINT64 = 2 ** 64
+
+
+def column_key(name, dtype):
+    data = f'{name}\0{dtype}'.encode('utf-8')
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'little')
+
+
+def block_rng(seed, key, block):
+    # Philox — счётчиковый генератор: ключ задаёт поток (seed, колонка), счётчик — номер блока
+    bit_generator = np.random.Philox(key=np.array([seed % UINT64, key], dtype=np.uint64),
+                                     counter=np.array([0, block, 0, 0], dtype=np.uint64))
+    return np.random.Generator(bit_generator)
+
+
+def block_faker_seed(seed, key, block):
+    return int(np.random.SeedSequence([seed % UINT64, key, block]).generate_state(1)[0])
+
+
+def row_blocks(seed, key, start, stop):
+    # Блоки, покрывающие строки [start, stop): номер блока, его RNG и границы нужных строк внутри блока
+    for block in range(start // ROW_BLOCK_SIZE, (stop - 1) // ROW_BLOCK_SIZE + 1):
+        block_start = block * ROW_BLOCK_SIZE
+        low = max(start, block_start) - block_start
+        high = min(stop, block_start + ROW_BLOCK_SIZE) - block_start
+        yield block, block_rng(seed, key, block), low, high
+
+
+def addressed_column(generate, key, start, stop, seed, vectorized=True):
+    # Векторные генераторы всегда строят блок целиком (их вывод для префикса блока
+    # не обязан совпадать), поштучные Faker-генераторы — только до нужной строки
+    parts = []
+    for block, rng, low, high in row_blocks(seed, key, start, stop):
+        seed_fakers(block_faker_seed(seed, key, block))
+        values = generate(ROW_BLOCK_SIZE if vectorized else high, rng)
+        parts.append(np.asarray(values, dtype=object if isinstance(values, list) else None)[low:high])
+    if not parts:
+        return np.asarray([], dtype=object)
+    return np.concatenate(parts) if len(parts) > 1 else parts[0]
+
+
+def addressed_records(group, start, stop, seed):
+    # Запись о человеке адресуется так же, как колонка: ключ потока — состав группы
+    if not group:
+        return {}
+    key = column_key('\0'.join(group), '\0'.join(group.values()))
+    parts = []
+    for _, rng, low, high in row_blocks(seed, key, start, stop):
+        records = person_records(group, ROW_BLOCK_SIZE, rng)
+        parts.append({name: values[low:high] for name, values in records.items()})
+    if not parts:
+        return person_records(group, 0, block_rng(seed, key, 0))
+    return {name: np.concatenate([part[name] for part in parts]) for name in group}
+
+
+def addressed_frame(columns, start, stop, seed):
+    # columns: [(имя, тип, генератор, векторный ли генератор)]
+    import pandas as pd
+
+    records = addressed_records(person_group((name, dtype) for name, dtype, _, _ in columns), start, stop, seed)
+    data = {name: records[name] if name in records
+            else addressed_column(generate, column_key(name, dtype), start, stop, seed, vectorized)
+            for name, dtype, generate, vectorized in columns}
+    with stage('dataframe', max(stop - start, 0)):
+        return build_frame(data, {name: type_kind(dtype) for name, dtype, _, _ in columns},
+                           index=pd.RangeIndex(0, max(stop - start, 0)))
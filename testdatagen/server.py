@@ -0,0 +1,310 @@
+import asyncio
+import io
+import json
+import multiprocessing
+import os
+import random
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from http import HTTPStatus
+
+from testdatagen.columns import arrow_table, text_frame
+from testdatagen.exporters import iter_ndjson
+from testdatagen.pipeline import plan_chunks
+from testdatagen.templates import DEFAULT_TEMPLATE_DIR, compile_template, normalize_template, template_path
+
+STREAM_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+    'parquet': 'application/vnd.apache.parquet',
+}
+PARQUET_COMPRESSIONS = ['none', 'snappy', 'gzip', 'zstd', 'brotli', 'lz4']
+MAX_BODY_SIZE = 1024 * 1024
+MAX_ROWS = int(os.environ.get('TESTDATAGEN_SERVER_MAX_ROWS', 10_000_000))
+# Чанки меньше, чем при записи в файл: первый байт ответа приходит быстрее
+DEFAULT_STREAM_CHUNK = 20_000
+MAX_STREAM_CHUNK = 1_000_000
+REQUEST_TIMEOUT = 30
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+# Код ниже выполняется в процессах пула: шаблон передаётся JSON-строкой,
+# а скомпилированный план переиспользуется между чанками одного запроса
+@lru_cache(maxsize=64)
+def cached_plan(template_json):
+    return compile_template(json.loads(template_json))
+
+
+def serialize_chunk(df, fmt, header):
+    if fmt == 'csv':
+        return text_frame(df).to_csv(index=False, header=header).encode('utf-8')
+    if fmt == 'ndjson':
+        return ''.join(iter_ndjson([df])).encode('utf-8')
+    return arrow_table(df)
+
+
+def render_chunk(template_json, start, count, seed, fmt):
+    df = cached_plan(template_json).rows_range(start, start + count, seed)
+    return serialize_chunk(df, fmt, start == 0)
+
+
+class ParquetStream:
+    # ParquetWriter пишет row group за row group; накопленные байты отдаются клиенту сразу,
+    # футер с метаданными уходит последним
+    def __init__(self, compression='snappy'):
+        self.compression = compression
+        self.writer = None
+        self.schema = None
+        self.sink = DrainSink()
+
+    def write(self, table):
+        import pyarrow.parquet as pq
+
+        if self.writer is None:
+            self.schema = table.schema
+            self.writer = pq.ParquetWriter(self.sink, self.schema, compression=self.compression)
+        elif not table.schema.equals(self.schema):
+            table = table.cast(self.schema)
+        self.writer.write_table(table)
+        return self.sink.drain()
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        return self.sink.drain()
+
+
+class DrainSink(io.RawIOBase):
+    def __init__(self):
+        self.parts = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def drain(self):
+        data = b''.join(self.parts)
+        self.parts = []
+        return data
+
+
+class GenerationRequest:
+    def __init__(self, data, template_dir=DEFAULT_TEMPLATE_DIR, pool_dir=None):
+        if not isinstance(data, dict):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, 'тело запроса должно быть JSON-объектом')
+        template = data.get('template', data)
+        if isinstance(template, str):
+            # Только по имени из каталога шаблонов: произвольные пути с диска не читаются
+            try:
+                with open(template_path(template, template_dir), encoding='utf-8') as f:
+                    template = json.load(f)
+            except OSError:
+                raise HTTPError(HTTPStatus.NOT_FOUND, f'шаблон не найден: {template}')
+        if not isinstance(template, dict):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, 'template должен быть объектом или именем шаблона')
+        try:
+            template = normalize_template(template)
+            self.rows = int(data.get('rows', template['rows']))
+            seed = data.get('seed', template['seed'])
+            self.seed = random.randrange(2 ** 32) if seed is None else int(seed)
+            self.chunk_size = int(data.get('chunk_size', DEFAULT_STREAM_CHUNK))
+        except (TypeError, ValueError) as e:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, str(e))
+        self.format = data.get('format') or (template['format'] if template['format'] in STREAM_FORMATS else 'csv')
+        if self.format not in STREAM_FORMATS:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"формат должен быть одним из: {', '.join(STREAM_FORMATS)}")
+        if not 0 <= self.rows <= MAX_ROWS:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f'rows должно быть от 0 до {MAX_ROWS}')
+        if not 1 <= self.chunk_size <= MAX_STREAM_CHUNK:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f'chunk_size должно быть от 1 до {MAX_STREAM_CHUNK}')
+        # Каталог пулов задаёт сервер, а не клиент
+        if pool_dir is None and any(column['pool'] for column in template['columns']):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, 'колонкам с pool нужен каталог пулов: запустите сервис с --pool-dir')
+        template['pool_dir'] = pool_dir
+        template['chunk_size'] = self.chunk_size
+        self.template = template
+        self.template_json = json.dumps(template, ensure_ascii=False, sort_keys=True)
+        self.compression = self.resolve_compression(data, template)
+        self.sequential = any(column['unique'] for column in template['columns'])
+
+    def resolve_compression(self, data, template):
+        # Сжатие есть только у потока parquet. Кодек из шаблона берётся, лишь если шаблон сам
+        # сохранён для parquet: compression у arrow и compress у текстовых форматов — кодеки других writer
+        if 'compression' in data and self.format != 'parquet':
+            raise HTTPError(HTTPStatus.BAD_REQUEST, 'compression применяется только к формату parquet')
+        if self.format != 'parquet':
+            return None
+        compression = data.get('compression')
+        if compression is None and template['format'] == 'parquet':
+            compression = template['options'].get('compression')
+        compression = compression or 'snappy'
+        if compression not in PARQUET_COMPRESSIONS:
+            raise HTTPError(HTTPStatus.BAD_REQUEST,
+                            f"сжатие parquet должно быть одним из: {', '.join(PARQUET_COMPRESSIONS)}")
+        return compression
+
+
+class GenerationServer:
+    def __init__(self, workers=None, template_dir=DEFAULT_TEMPLATE_DIR, pool_dir=None):
+        self.workers = workers or os.cpu_count()
+        self.template_dir = template_dir
+        self.pool_dir = pool_dir
+        # spawn: процессы пула создаются из работающего event loop, fork здесь небезопасен
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'))
+
+    async def iter_parallel(self, request):
+        # Чанки адресуются по номеру строки, поэтому их можно строить в разных процессах;
+        # вперёд запрашиваются не больше двух, чтобы медленный клиент не копил данные в памяти
+        loop = asyncio.get_running_loop()
+        pending = deque()
+        try:
+            for _, start, count in plan_chunks(request.rows, request.chunk_size):
+                pending.append(loop.run_in_executor(self.pool, render_chunk, request.template_json, start, count,
+                                                    request.seed, request.format))
+                if len(pending) >= 2:
+                    yield await pending.popleft()
+            while pending:
+                yield await pending.popleft()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    async def iter_sequential(self, request):
+        # Уникальные колонки зависят от уже выданных значений: чанки строятся по очереди в потоке
+        loop = asyncio.get_running_loop()
+        plan = compile_template(request.template)
+        chunks = plan.iter_chunks(request.rows, request.seed)
+        header = True
+        while True:
+            df = await loop.run_in_executor(None, next, chunks, None)
+            if df is None:
+                return
+            yield await loop.run_in_executor(None, serialize_chunk, df, request.format, header)
+            header = False
+
+    async def generate(self, request, writer):
+        loop = asyncio.get_running_loop()
+        await send_head(writer, HTTPStatus.OK, STREAM_FORMATS[request.format],
+                        {'Transfer-Encoding': 'chunked', 'X-Testdatagen-Seed': str(request.seed)})
+        parquet = ParquetStream(request.compression) if request.format == 'parquet' else None
+        chunks = self.iter_sequential(request) if request.sequential else self.iter_parallel(request)
+        try:
+            async for data in chunks:
+                if parquet is not None:
+                    data = await loop.run_in_executor(None, parquet.write, data)
+                await send_chunk(writer, data)
+        finally:
+            # При обрыве соединения отменяем ещё не начатые чанки
+            await chunks.aclose()
+        if parquet is not None:
+            await send_chunk(writer, await loop.run_in_executor(None, parquet.close))
+        writer.write(b'0\r\n\r\n')
+        await writer.drain()
+
+    async def route(self, method, path, body, writer):
+        path = path.split('?', 1)[0]
+        if path == '/health' and method == 'GET':
+            return await send_json(writer, HTTPStatus.OK, {'status': 'ok', 'workers': self.workers})
+        if path == '/types' and method == 'GET':
+            from testdatagen.data_types import DATA_TYPES
+            return await send_json(writer, HTTPStatus.OK, list(DATA_TYPES))
+        if path == '/generate' and method == 'POST':
+            try:
+                data = json.loads(body or b'{}')
+            except ValueError:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, 'тело запроса не является JSON')
+            request = GenerationRequest(data, self.template_dir, self.pool_dir)
+            return await self.generate(request, writer)
+        if path in ('/health', '/types', '/generate'):
+            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, 'метод не поддерживается')
+        raise HTTPError(HTTPStatus.NOT_FOUND, 'не найдено')
+
+    async def handle(self, reader, writer):
+        try:
+            method, path, body = await asyncio.wait_for(read_request(reader), REQUEST_TIMEOUT)
+            await self.route(method, path, body, writer)
+        except HTTPError as e:
+            # HTTPError возникает только до начала потока, пока заголовки ещё не отправлены
+            await send_json(writer, e.status, {'error': e.message})
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except Exception as e:
+            # Ошибка посреди потока: заголовки уже отправлены, поэтому просто обрываем соединение
+            print(f'Ошибка обработки запроса: {e!r}', file=sys.stderr)
+        finally:
+            writer.close()
+
+    async def serve(self, host, port):
+        server = await asyncio.start_server(self.handle, host, port)
+        addresses = ', '.join(f'{sock.getsockname()[0]}:{sock.getsockname()[1]}' for sock in server.sockets)
+        print(f'Сервис генерации слушает {addresses}', file=sys.stderr)
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+
+
+async def read_request(reader):
+    request_line = (await reader.readline()).decode('latin-1').rstrip('\r\n')
+    parts = request_line.split()
+    if len(parts) != 3:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, 'некорректная строка запроса')
+    headers = {}
+    while True:
+        line = (await reader.readline()).decode('latin-1').rstrip('\r\n')
+        if not line:
+            break
+        name, _, value = line.partition(':')
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get('content-length') or 0)
+    if length > MAX_BODY_SIZE:
+        raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, 'слишком большое тело запроса')
+    body = await reader.readexactly(length) if length else b''
+    return parts[0].upper(), parts[1], body
+
+
+async def send_head(writer, status, content_type, headers=None):
+    lines = [f'HTTP/1.1 {status.value} {status.phrase}', f'Content-Type: {content_type}', 'Connection: close']
+    lines += [f'{name}: {value}' for name, value in (headers or {}).items()]
+    writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+    await writer.drain()
+
+
+async def send_chunk(writer, data):
+    if data:
+        writer.write(b'%X\r\n%s\r\n' % (len(data), data))
+        await writer.drain()
+
+
+async def send_json(writer, status, data):
+    body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+    await send_head(writer, status, 'application/json; charset=utf-8', {'Content-Length': len(body)})
+    writer.write(body)
+    await writer.drain()
+
+
+def run_server(host='127.0.0.1', port=8080, workers=None, template_dir=DEFAULT_TEMPLATE_DIR, pool_dir=None):
+    server = GenerationServer(workers, template_dir, pool_dir)
+    try:
+        asyncio.run(server.serve(host, port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
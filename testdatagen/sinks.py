@@ -0,0 +1,161 @@
+import queue
+import sqlite3
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from testdatagen.columns import text_frame
+from testdatagen.exporters import copy_header, copy_rows, safe_name
+
+PLACEHOLDERS = {
+    'qmark': lambda n: ['?'] * n,
+    'format': lambda n: ['%s'] * n,
+    'pyformat': lambda n: ['%s'] * n,
+    'numeric': lambda n: [f':{i + 1}' for i in range(n)],
+}
+
+
+class ConnectionPool:
+    # Пул DB-API соединений: соединения создаются по требованию (не больше size)
+    # и переиспользуются между чанками и заданиями
+
+    def __init__(self, connect, size=4):
+        self.connect = connect
+        self.size = size
+        self.idle = queue.LifoQueue()
+        self.created = 0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        try:
+            return self.idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self.lock:
+            if self.created < self.size:
+                self.created += 1
+                return self.connect()
+        return self.idle.get()
+
+    def release(self, conn):
+        self.idle.put(conn)
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        try:
+            yield conn
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self.release(conn)
+
+    def close(self):
+        while True:
+            try:
+                self.idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+def sqlite_connect(path):
+    conn = sqlite3.connect(path, timeout=60, check_same_thread=False)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    return conn
+
+
+def column_sql_type(dtype):
+    import pandas as pd
+
+    if pd.api.types.is_bool_dtype(dtype):
+        return 'BOOLEAN'
+    if pd.api.types.is_integer_dtype(dtype):
+        return 'BIGINT'
+    if pd.api.types.is_float_dtype(dtype):
+        return 'DOUBLE PRECISION'
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return 'TIMESTAMP'
+    return 'TEXT'
+
+
+def create_table_sql(df, table_name="test_data"):
+    columns = ', '.join(f'{safe_name(col)} {column_sql_type(dtype)}' for col, dtype in df.dtypes.items())
+    return f'CREATE TABLE IF NOT EXISTS {safe_name(table_name)} ({columns})'
+
+
+def chunk_rows(df):
+    import pandas as pd
+
+    columns = []
+    for i in range(len(df.columns)):
+        series = df.iloc[:, i]
+        values = series.dt.strftime('%Y-%m-%d %H:%M:%S') if pd.api.types.is_datetime64_any_dtype(series.dtype) \
+            else series
+        columns.append(values.astype(object).where(series.notna(), None).tolist())
+    return list(zip(*columns))
+
+
+def load_chunk(conn, df, table_name="test_data", paramstyle='qmark'):
+    cursor = conn.cursor()
+    try:
+        # psycopg2 умеет COPY — это самый быстрый путь загрузки в PostgreSQL
+        if hasattr(cursor, 'copy_expert'):
+            import io
+            cursor.copy_expert(copy_header(df, table_name).rstrip().rstrip(';'), io.StringIO(copy_rows(df)))
+        else:
+            columns = ', '.join(safe_name(col) for col in df.columns)
+            marks = ', '.join(PLACEHOLDERS[paramstyle](len(df.columns)))
+            cursor.executemany(f'INSERT INTO {safe_name(table_name)} ({columns}) VALUES ({marks})', chunk_rows(df))
+    finally:
+        cursor.close()
+
+
+def write_database(chunks, pool, table_name="test_data", paramstyle='qmark', create_table=True, workers=1):
+    if paramstyle not in PLACEHOLDERS:
+        raise ValueError(f'Неподдерживаемый paramstyle: {paramstyle}')
+
+    # Каждый чанк загружается в собственной транзакции
+    def load(df):
+        with pool.connection() as conn:
+            load_chunk(conn, df, table_name, paramstyle)
+            conn.commit()
+        return len(df)
+
+    # Типизированные колонки загружаются в том же текстовом виде, что и при экспорте в файлы
+    chunks = map(text_frame, chunks)
+    first = next(chunks, None)
+    if first is None:
+        return 0
+    if create_table:
+        with pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(create_table_sql(first, table_name))
+            cursor.close()
+            conn.commit()
+
+    total = load(first)
+    if workers <= 1:
+        for df in chunks:
+            total += load(df)
+        return total
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for df in chunks:
+            pending.append(executor.submit(load, df))
+            if len(pending) >= 2 * workers:
+                total += pending.popleft().result()
+        while pending:
+            total += pending.popleft().result()
+    return total
+
+
+def write_sqlite(chunks, out, table_name="test_data"):
+    pool = ConnectionPool(lambda: sqlite_connect(out), size=1)
+    try:
+        return write_database(chunks, pool, table_name)
+    finally:
+        pool.close()
@@ -0,0 +1,181 @@
+import json
+import os
+
+import numpy as np
+
+from testdatagen.columns import build_frame, type_kind
+from testdatagen.data_types import DATA_TYPES
+from testdatagen.engine import column_generator, is_vectorized
+from testdatagen.exporters import FILE_EXTENSIONS, safe_name
+from testdatagen.people import person_group, person_records
+from testdatagen.pipeline import (
+    DEFAULT_CHUNK_SIZE,
+    chunk_rng,
+    plan_chunks,
+    unique_indexes,
+    write_output,
+)
+from testdatagen.profiling import stage
+from testdatagen.seeding import addressed_frame
+
+DEFAULT_TEMPLATE_DIR = os.environ.get('TESTDATAGEN_TEMPLATES', 'templates')
+
+
+def normalize_template(data):
+    # Старый формат из session_state: {'types': [...], 'count': n}
+    if 'columns' not in data and 'types' in data:
+        data = dict(data, columns=[{'type': t} for t in data['types']], rows=data.get('count', 10))
+    columns = []
+    for column in data.get('columns', []):
+        column = {'type': column} if isinstance(column, str) else dict(column)
+        if column.get('type') not in DATA_TYPES:
+            raise ValueError(f"Неизвестный тип данных: {column.get('type')}")
+        column.setdefault('name', column['type'])
+        column.setdefault('unique', False)
+        column.setdefault('pool', False)
+        columns.append(column)
+    if not columns:
+        raise ValueError('В шаблоне нет ни одной колонки')
+    names = [column['name'] for column in columns]
+    if len(set(names)) != len(names):
+        raise ValueError('Имена колонок в шаблоне должны быть уникальными')
+    pooled = [column['name'] for column in columns if column['pool']]
+    if pooled and not data.get('pool_dir'):
+        raise ValueError(f"Колонкам с pool нужен каталог пулов (pool_dir): {', '.join(pooled)}")
+    fmt = data.get('format', 'csv')
+    if fmt not in FILE_EXTENSIONS:
+        raise ValueError(f'Неизвестный формат: {fmt}')
+    rows = int(data.get('rows', 10))
+    if rows < 0:
+        raise ValueError('Количество записей не может быть отрицательным')
+    return {
+        'name': data.get('name', 'template'),
+        'rows': rows,
+        'columns': columns,
+        'seed': data.get('seed'),
+        'format': fmt,
+        'options': dict(data.get('options', {})),
+        'chunk_size': int(data.get('chunk_size', DEFAULT_CHUNK_SIZE)),
+        'pool_dir': data.get('pool_dir'),
+    }
+
+
+def make_template(name, types, rows, seed=None, fmt='csv', **extra):
+    return normalize_template(dict(extra, name=name, columns=list(types), rows=rows, seed=seed, format=fmt))
+
+
+def template_path(name, template_dir=DEFAULT_TEMPLATE_DIR):
+    return os.path.join(template_dir, f'{safe_name(name)}.json')
+
+
+def save_template(template, template_dir=DEFAULT_TEMPLATE_DIR):
+    template = normalize_template(template)
+    os.makedirs(template_dir, exist_ok=True)
+    path = template_path(template['name'], template_dir)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(template, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_template(name_or_path, template_dir=DEFAULT_TEMPLATE_DIR):
+    path = name_or_path if os.path.exists(name_or_path) else template_path(name_or_path, template_dir)
+    with open(path, encoding='utf-8') as f:
+        return normalize_template(json.load(f))
+
+
+def list_templates(template_dir=DEFAULT_TEMPLATE_DIR):
+    if not os.path.isdir(template_dir):
+        return {}
+    templates = {}
+    for filename in sorted(os.listdir(template_dir)):
+        if filename.endswith('.json'):
+            template = load_template(os.path.join(template_dir, filename))
+            templates[template['name']] = template
+    return templates
+
+
+def delete_template(name, template_dir=DEFAULT_TEMPLATE_DIR):
+    path = template_path(name, template_dir)
+    if os.path.exists(path):
+        os.remove(path)
+
+
+class GenerationPlan:
+    # Скомпилированный шаблон: генераторы колонок и разбиение на чанки
+    # определяются один раз, дальше план можно запускать многократно
+
+    def __init__(self, template):
+        self.template = normalize_template(template)
+        self.rows = self.template['rows']
+        self.seed = self.template['seed']
+        self.chunk_size = self.template['chunk_size']
+        self.format = self.template['format']
+        self.options = self.template['options']
+        self.columns = []
+        for column in self.template['columns']:
+            pool_dir = self.template['pool_dir'] if column['pool'] else None
+            if pool_dir is not None:
+                from testdatagen.pools import prepare_pools
+                prepare_pools([column['type']], pool_dir, seed=self.seed)
+            self.columns.append((column['name'], column['type'], column_generator(column['type'], pool_dir),
+                                 pool_dir, column['unique']))
+        self.unique_types = [dtype for _, dtype, _, _, unique in self.columns if unique]
+        self.people = person_group((name, dtype) for name, dtype, _, _, unique in self.columns if not unique)
+        self.kinds = {name: type_kind(dtype) for name, dtype, _, _, _ in self.columns}
+        self.addressed = [(name, dtype, generate, is_vectorized(dtype, pool_dir))
+                          for name, dtype, generate, pool_dir, _ in self.columns]
+
+    def build_chunk(self, count, rng, unique=None):
+        from testdatagen.unique import unique_column
+
+        records = person_records(self.people, count, rng)
+        data = {}
+        for name, dtype, generate, pool_dir, is_unique in self.columns:
+            if name in records:
+                data[name] = records[name]
+            elif is_unique:
+                data[name] = unique_column(dtype, count, unique[dtype], rng, pool_dir)
+            else:
+                data[name] = generate(count, rng)
+        with stage('dataframe', count):
+            return build_frame(data, self.kinds)
+
+    def resolve_seed(self, seed, start=0):
+        seed = self.seed if seed is None else seed
+        if start and (seed is None or self.unique_types):
+            raise ValueError('срез строк доступен только с seed и без уникальных колонок')
+        return seed
+
+    def iter_chunks(self, rows=None, seed=None, start=0):
+        rows = self.rows if rows is None else rows
+        seed = self.resolve_seed(seed, start)
+        if seed is not None and not self.unique_types:
+            for chunk_start in range(start, start + rows, self.chunk_size):
+                yield addressed_frame(self.addressed, chunk_start, min(chunk_start + self.chunk_size, start + rows), seed)
+            return
+        unique = unique_indexes(self.unique_types, rows)
+        rng = np.random.default_rng() if seed is None else None
+        for index, _, count in plan_chunks(rows, self.chunk_size):
+            yield self.build_chunk(count, rng if seed is None else chunk_rng(seed, index), unique)
+
+    def dataframe(self, rows=None, seed=None, start=0):
+        import pandas as pd
+
+        chunks = list(self.iter_chunks(rows, self.resolve_seed(seed, start), start))
+        return pd.concat(chunks, ignore_index=True) if chunks else self.build_chunk(0, np.random.default_rng())
+
+    def rows_range(self, start, stop, seed=None):
+        # Строки [start, stop) полного набора без генерации предыдущих
+        return self.dataframe(max(stop - start, 0), seed, start)
+
+    def run(self, out, rows=None, seed=None, start=0):
+        # Проверяем до открытия файла: iter_chunks — ленивый генератор
+        seed = self.resolve_seed(seed, start)
+        # Опции шаблона могут включать сжатие (compress) и деление на части (part_rows, part_size)
+        return write_output(self.iter_chunks(rows, seed, start), self.format, out, **self.options)
+
+
+def compile_template(template):
+    return GenerationPlan(template)
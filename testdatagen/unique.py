@@ -0,0 +1,128 @@
+import math
+
+import numpy as np
+
+# Для идентификаторов уникальность значения равна уникальности «тела» без контрольных цифр:
+# (всего цифр в значении, цифр в теле)
+IDENTIFIER_DIGITS = {
+    "СНИЛС": (11, 9),
+    "ИНН (физлицо)": (12, 10),
+    "ИНН (юрлицо)": (10, 9),
+    "Банковская карта": (16, 15),
+}
+
+# Битовое множество по всему пространству тел используется, пока оно занимает не больше 128 МБ
+MAX_BITSET_SIZE = 2 ** 30
+MAX_STALE_ROUNDS = 100
+
+
+def set_bits(bits, positions):
+    np.bitwise_or.at(bits, positions >> 3, np.left_shift(1, positions & 7).astype(np.uint8))
+
+
+def test_bits(bits, positions):
+    return ((bits[positions >> 3] >> (positions & 7)) & 1).astype(bool)
+
+
+class BitSet:
+    # Точное множество целых чисел из [0, size): один бит на значение
+
+    def __init__(self, size):
+        self.bits = np.zeros((size + 7) // 8, dtype=np.uint8)
+
+    def new_mask(self, keys):
+        keys = np.asarray(keys, dtype=np.int64)
+        unique_keys, first = np.unique(keys, return_index=True)
+        mask = np.zeros(len(keys), dtype=bool)
+        mask[first[~test_bits(self.bits, unique_keys)]] = True
+        return mask
+
+    def add(self, keys):
+        set_bits(self.bits, np.asarray(keys, dtype=np.int64))
+
+
+class BloomFilter:
+    # Ложноположительные срабатывания только отбраковывают лишние значения,
+    # поэтому уникальность остаётся гарантированной
+
+    def __init__(self, capacity, error_rate=0.01):
+        capacity = max(capacity, 1)
+        self.size = max(64, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = np.zeros((self.size + 7) // 8, dtype=np.uint8)
+
+    def positions(self, hashes):
+        # Двойное хеширование: h1 + i * h2 по модулю размера фильтра
+        h1 = hashes & np.uint64(0xFFFFFFFF)
+        h2 = (hashes >> np.uint64(32)) | np.uint64(1)
+        steps = np.arange(self.hashes, dtype=np.uint64)
+        return ((h1[:, None] + steps * h2[:, None]) % np.uint64(self.size)).astype(np.int64)
+
+    def new_mask(self, hashes):
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        unique_hashes, first = np.unique(hashes, return_index=True)
+        new = ~test_bits(self.bits, self.positions(unique_hashes)).all(axis=1)
+        mask = np.zeros(len(hashes), dtype=bool)
+        mask[first[new]] = True
+        return mask
+
+    def add(self, hashes):
+        set_bits(self.bits, self.positions(np.asarray(hashes, dtype=np.uint64)).ravel())
+
+
+def identifier_keys(values, total_digits, body_digits):
+    values = np.asarray(values)
+    if values.dtype.kind in 'iu':
+        # Типизированная колонка уже хранит тело идентификатора числом
+        return values.astype(np.int64)
+    from testdatagen.validators import digit_layout
+
+    data, _, is_digit, _ = digit_layout(values)
+    digits = (data[is_digit] - ord('0')).astype(np.int64).reshape(-1, total_digits)[:, :body_digits]
+    return digits @ (10 ** np.arange(body_digits - 1, -1, -1, dtype=np.int64))
+
+
+class UniqueIndex:
+    def __init__(self, dtype, capacity, error_rate=0.01):
+        import pandas as pd
+
+        self.hash_array = pd.util.hash_array
+        self.digits = IDENTIFIER_DIGITS.get(dtype)
+        if self.digits is not None and 10 ** self.digits[1] <= MAX_BITSET_SIZE:
+            self.seen = BitSet(10 ** self.digits[1])
+            self.exact = True
+        else:
+            self.seen = BloomFilter(capacity, error_rate)
+            self.exact = False
+
+    def add_new(self, values, limit=None):
+        # Маска первых limit новых значений. В индекс записываются только они: отброшенные
+        # значения не расходуют домен и не заполняют фильтр сверх его ёмкости
+        keys = identifier_keys(values, *self.digits) if self.digits is not None else np.asarray(values, dtype=object)
+        keys = keys if self.exact else self.hash_array(keys)
+        mask = self.seen.new_mask(keys)
+        if limit is not None:
+            mask[np.flatnonzero(mask)[limit:]] = False
+        self.seen.add(keys[mask])
+        return mask
+
+
+def unique_column(dtype, count, index, rng=None, pool_dir=None):
+    from testdatagen.engine import generate_column
+
+    parts = []
+    have = 0
+    stale = 0
+    while have < count:
+        need = count - have
+        values = np.asarray(generate_column(dtype, need + need // 10 + 16, rng, pool_dir))
+        accepted = values[index.add_new(values, need)]
+        if len(accepted) == 0:
+            stale += 1
+            if stale >= MAX_STALE_ROUNDS:
+                raise ValueError(f'Не удалось получить {count} уникальных значений для типа «{dtype}»')
+            continue
+        stale = 0
+        parts.append(accepted)
+        have += len(accepted)
+    return np.concatenate(parts) if parts else np.asarray([], dtype=object)
@@ -0,0 +1,190 @@
+import re
+from itertools import islice
+
+import numpy as np
+
+from testdatagen.generators import inn10_control, inn12_controls, luhn_check_digit, snils_control
+
+
+def validate_snils(snils):
+    clean = re.sub(r'\D', '', snils)
+    if len(clean) != 11:
+        return False, "СНИЛС должен содержать 11 цифр"
+    digits = [int(d) for d in clean[:9]]
+    control = int(clean[9:11])
+    checksum = sum((9 - i) * digits[i] for i in range(9))
+    if checksum < 100:
+        expected = checksum
+    elif checksum == 100 or checksum == 101:
+        expected = 0
+    else:
+        expected = checksum % 101
+        if expected == 100:
+            expected = 0
+    if control == expected:
+        return True, "СНИЛС валиден"
+    return False, f"Неверная контрольная сумма (ожидалось {expected:02d})"
+
+
+def validate_inn(inn):
+    clean = re.sub(r'\D', '', inn)
+    if len(clean) == 12:
+        digits = [int(d) for d in clean]
+        weights1 = [7, 2, 4, 10, 3, 5, 9, 4, 6, 8]
+        weights2 = [3, 7, 2, 4, 10, 3, 5, 9, 4, 6, 8]
+        n11 = sum(digits[i] * weights1[i] for i in range(10)) % 11 % 10
+        n12 = sum(digits[i] * weights2[i] for i in range(11)) % 11 % 10
+        if digits[10] == n11 and digits[11] == n12:
+            return True, "ИНН физлица валиден"
+        return False, "Неверная контрольная сумма ИНН физлица"
+    elif len(clean) == 10:
+        digits = [int(d) for d in clean]
+        weights = [2, 4, 10, 3, 5, 9, 4, 6, 8]
+        n10 = sum(digits[i] * weights[i] for i in range(9)) % 11 % 10
+        if digits[9] == n10:
+            return True, "ИНН юрлица валиден"
+        return False, "Неверная контрольная сумма ИНН юрлица"
+    return False, "ИНН должен содержать 10 или 12 цифр"
+
+
+def validate_card(card):
+    clean = re.sub(r'\D', '', card)
+    if len(clean) != 16:
+        return False, "Номер карты должен содержать 16 цифр"
+
+    def luhn_check(card_number):
+        digits = [int(d) for d in card_number]
+        odd_digits = digits[-1::-2]
+        even_digits = digits[-2::-2]
+        checksum = sum(odd_digits)
+        for d in even_digits:
+            checksum += sum(int(x) for x in str(d * 2))
+        return checksum % 10 == 0
+
+    if luhn_check(clean):
+        return True, "Номер карты валиден (Luhn)"
+    return False, "Неверная контрольная сумма Luhn"
+
+
+# Пакетная проверка: цифры всей колонки выбираются одной маской по байтам,
+# контрольные суммы считаются над матрицей цифр
+REASON_OK = 0
+REASON_LENGTH = 1
+REASON_CHECKSUM = 2
+REASON_NAMES = {
+    REASON_OK: 'ok',
+    REASON_LENGTH: 'length',
+    REASON_CHECKSUM: 'checksum',
+}
+
+
+def string_array(values):
+    import pyarrow as pa
+
+    try:
+        return pa.array(values, type=pa.large_string(), from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return pa.array([None if v is None else str(v) for v in values], type=pa.large_string())
+
+
+def digit_layout(values):
+    # Работаем прямо с буферами Arrow: байты всех строк лежат подряд, по смещениям
+    # восстанавливается номер строки каждого байта, а цифры отбираются маской
+    arr = string_array(values)
+    offsets = np.frombuffer(arr.buffers()[1], dtype=np.int64)[arr.offset:arr.offset + len(arr) + 1]
+    data_buffer = arr.buffers()[2]
+    data = np.frombuffer(data_buffer, dtype=np.uint8) if data_buffer is not None else np.empty(0, np.uint8)
+    data = data[offsets[0]:offsets[-1]]
+    rows = np.repeat(np.arange(len(arr)), np.diff(offsets))
+    is_digit = (data >= ord('0')) & (data <= ord('9'))
+    counts = np.bincount(rows[is_digit], minlength=len(arr))
+    return data, rows, is_digit, counts
+
+
+def summarize(reasons):
+    counts = np.bincount(reasons, minlength=len(REASON_NAMES))
+    summary = {'total': int(len(reasons)), 'valid': int(counts[REASON_OK])}
+    summary['invalid'] = summary['total'] - summary['valid']
+    for code, name in REASON_NAMES.items():
+        if code != REASON_OK:
+            summary[name] = int(counts[code])
+    return summary
+
+
+def check_batch(values, checks):
+    # checks: {количество цифр: функция(матрица цифр) -> маска верных контрольных сумм}
+    data, rows, is_digit, counts = digit_layout(values)
+    reasons = np.full(len(counts), REASON_LENGTH, dtype=np.uint8)
+    for width, check in checks.items():
+        matching = counts == width
+        digits = (data[is_digit & matching[rows]] - ord('0')).astype(np.int64).reshape(-1, width)
+        reasons[matching] = np.where(check(digits), REASON_OK, REASON_CHECKSUM)
+    return reasons == REASON_OK, reasons, summarize(reasons)
+
+
+def snils_ok(digits):
+    return digits[:, 9] * 10 + digits[:, 10] == snils_control(digits[:, :9])
+
+
+def inn12_ok(digits):
+    n11, n12 = inn12_controls(digits)
+    return (digits[:, 10] == n11) & (digits[:, 11] == n12)
+
+
+def inn10_ok(digits):
+    return digits[:, 9] == inn10_control(digits)
+
+
+def card_ok(digits):
+    return digits[:, 15] == luhn_check_digit(digits[:, :15])
+
+
+def validate_snils_batch(values):
+    return check_batch(values, {11: snils_ok})
+
+
+def validate_inn_batch(values):
+    return check_batch(values, {12: inn12_ok, 10: inn10_ok})
+
+
+def validate_card_batch(values):
+    return check_batch(values, {16: card_ok})
+
+
+BATCH_VALIDATORS = {
+    'snils': validate_snils_batch,
+    'inn': validate_inn_batch,
+    'card': validate_card_batch,
+}
+
+
+def iter_file_values(source, column=None, chunk_size=100_000):
+    # Без column файл читается как одно значение на строку, иначе — как CSV с заголовком
+    import pandas as pd
+
+    if column is not None:
+        for chunk in pd.read_csv(source, usecols=[column], dtype=str, keep_default_na=False,
+                                 chunksize=chunk_size):
+            yield chunk[column]
+        return
+
+    stream = open(source, encoding='utf-8') if isinstance(source, str) else source
+    try:
+        while True:
+            lines = [line.rstrip('\r\n') for line in islice(stream, chunk_size)]
+            if not lines:
+                return
+            yield pd.Series(lines, dtype=object)
+    finally:
+        if stream is not source:
+            stream.close()
+
+
+def validate_file(source, kind, column=None, chunk_size=100_000):
+    validate = BATCH_VALIDATORS[kind]
+    total = dict.fromkeys(summarize(np.empty(0, dtype=np.uint8)), 0)
+    for values in iter_file_values(source, column, chunk_size):
+        _, _, summary = validate(values)
+        for key, count in summary.items():
+            total[key] += count
+    return total